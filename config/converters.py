@@ -0,0 +1,34 @@
+"""
+Custom URL path converters.
+
+Called by:
+    - config.urls
+"""
+
+import functools
+import uuid
+
+from django.urls.converters import UUIDConverter
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_uuid(value: str) -> uuid.UUID:
+    """
+    Parses a UUID string, memoized; report pages re-request the same pk every few seconds while polling.
+    Called by: CachedUUIDConverter.to_python()
+    """
+    return uuid.UUID(value)
+
+
+class CachedUUIDConverter(UUIDConverter):
+    """
+    UUID path converter that reuses the parsed UUID for repeated htmx polls of the same report.
+    Called by: config.urls (registered as `cached_uuid`)
+    """
+
+    def to_python(self, value: str) -> uuid.UUID:
+        """
+        Converts the matched path segment to a UUID.
+        Called by: django's URL resolver
+        """
+        return parse_uuid(value)
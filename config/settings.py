@@ -222,10 +222,13 @@ PDF_UPLOAD_PATH: str = os.environ['PDF_UPLOAD_PATH']
 ## Synchronous processing timeouts (web requests)
 VERAPDF_SYNC_TIMEOUT_SECONDS: float = 30.0
 OPENROUTER_SYNC_TIMEOUT_SECONDS: float = 30.0
+OPENROUTER_SYNC_ENABLED: bool = json.loads(os.environ.get('OPENROUTER_SYNC_ENABLED_JSON', 'true'))  # false: cron-only
+SYNC_PROCESSING_ENABLED: bool = json.loads(os.environ.get('SYNC_PROCESSING_ENABLED_JSON', 'true'))  # false: queue for cron
 
 ## Cron job timeouts (background processing - more patient)
 VERAPDF_CRON_TIMEOUT_SECONDS: float = 60.0
 OPENROUTER_CRON_TIMEOUT_SECONDS: float = 60.0
+OPENROUTER_CRON_RETRY_DEADLINE_SECONDS: float = 180.0  # transient 429/5xx retry budget; keep well under the stuck threshold
 
 ## Stuck processing recovery threshold (10 minutes)
 RECOVER_STUCK_PROCESSING_AFTER_SECONDS: int = 600
@@ -235,10 +235,13 @@ PDF_UPLOAD_PATH: str = '/baz'
 ## Synchronous processing timeouts (web requests)
 VERAPDF_SYNC_TIMEOUT_SECONDS: float = 30.0
 OPENROUTER_SYNC_TIMEOUT_SECONDS: float = 30.0
+OPENROUTER_SYNC_ENABLED: bool = True
+SYNC_PROCESSING_ENABLED: bool = True
 
 ## Cron job timeouts (background processing - more patient)
 VERAPDF_CRON_TIMEOUT_SECONDS: float = 60.0
 OPENROUTER_CRON_TIMEOUT_SECONDS: float = 60.0
+OPENROUTER_CRON_RETRY_DEADLINE_SECONDS: float = 180.0  # transient 429/5xx retry budget; keep well under the stuck threshold
 
 ## Stuck processing recovery threshold (10 minutes)
 RECOVER_STUCK_PROCESSING_AFTER_SECONDS: int = 600
@@ -1,16 +1,19 @@
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, register_converter
 
+from config.converters import CachedUUIDConverter
 from pdf_checker_app import views
 
+register_converter(CachedUUIDConverter, 'cached_uuid')
+
 urlpatterns = [
     ## main ---------------------------------------------------------
     path('pdf_uploader/', views.upload_pdf, name='pdf_upload_url'),
-    path('pdf/report/<uuid:pk>/', views.view_report, name='pdf_report_url'),
+    path('pdf/report/<cached_uuid:pk>/', views.view_report, name='pdf_report_url'),
     ## htmx fragment endpoints --------------------------------------
-    path('pdf/report/<uuid:pk>/status.fragment', views.status_fragment, name='status_fragment_url'),
-    path('pdf/report/<uuid:pk>/verapdf.fragment', views.verapdf_fragment, name='verapdf_fragment_url'),
-    path('pdf/report/<uuid:pk>/summary.fragment', views.summary_fragment, name='summary_fragment_url'),
+    path('pdf/report/<cached_uuid:pk>/status.fragment', views.status_fragment, name='status_fragment_url'),
+    path('pdf/report/<cached_uuid:pk>/verapdf.fragment', views.verapdf_fragment, name='verapdf_fragment_url'),
+    path('pdf/report/<cached_uuid:pk>/summary.fragment', views.summary_fragment, name='summary_fragment_url'),
     path('info/', views.info, name='info_url'),
     ## other --------------------------------------------------------
     path('', views.root, name='root_url'),
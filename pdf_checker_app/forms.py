@@ -1,12 +1,22 @@
+import functools
+from types import ModuleType
+
 from django import forms
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 
-try:
-    import magic
-    MAGIC_AVAILABLE = True
-except (ImportError, OSError):
-    MAGIC_AVAILABLE = False
+
+@functools.lru_cache(maxsize=1)
+def get_magic() -> ModuleType | None:
+    """
+    Imports python-magic on first use, so libmagic is only loaded by processes that validate uploads.
+    Returns None if python-magic or libmagic is unavailable; the result is cached either way.
+    """
+    try:
+        import magic
+    except (ImportError, OSError):
+        magic = None
+    return magic
 
 
 class PDFUploadForm(forms.Form):
@@ -36,24 +46,24 @@ class PDFUploadForm(forms.Form):
         if not file.name.lower().endswith('.pdf'):
             raise ValidationError('File must have a .pdf extension.')
         
-        ## Check PDF magic bytes (PDF files start with %PDF-)
+        ## Read the header once; it serves both the magic-bytes check and python-magic (PDF files start with %PDF-)
         file.seek(0)
-        header = file.read(5)
+        head = file.read(2048)
         file.seek(0)  # Reset file pointer
         
-        if header != b'%PDF-':
+        if head[:5] != b'%PDF-':
             raise ValidationError('File must be a valid PDF document.')
         
         ## If python-magic is available, use it for additional validation
-        if MAGIC_AVAILABLE:
+        magic = get_magic()
+        if magic is not None:
             try:
-                file_type = magic.from_buffer(file.read(2048), mime=True)
-                file.seek(0)  # Reset file pointer
-                
-                if file_type != 'application/pdf':
-                    raise ValidationError('File must be a PDF document.')
+                file_type = magic.from_buffer(head, mime=True)
             except Exception:
                 ## If magic fails, rely on the header check above
-                pass
+                file_type = 'application/pdf'
+            
+            if file_type != 'application/pdf':
+                raise ValidationError('File must be a PDF document.')
         
         return file
@@ -0,0 +1,80 @@
+"""
+JSON encoding/decoding helpers backed by orjson.
+
+Called by:
+    - pdf_checker_app.models (JSONField encoder/decoder)
+"""
+
+import json
+
+import orjson
+
+
+## datetimes and dataclasses go to the stdlib fallback (which rejects them) rather than orjson's own serializers
+ORJSON_ENCODE_OPTIONS: int = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+## the encoder attributes json.dumps() sets when called without options, as Django's JSONField calls it
+DEFAULT_ENCODER_OPTIONS: dict[str, object] = {
+    'skipkeys': False,
+    'ensure_ascii': True,
+    'check_circular': True,
+    'allow_nan': True,
+    'sort_keys': False,
+    'indent': None,
+    'item_separator': ', ',
+    'key_separator': ': ',
+}
+
+
+class OrjsonJSONEncoder(json.JSONEncoder):
+    """
+    JSONEncoder whose encode() serializes with orjson.
+    Django's JSONField calls `json.dumps(value, cls=encoder)`, which lands here, so large payloads skip the pure-Python path.
+    Falls back to the stdlib encoder for values orjson rejects (e.g. Decimal, non-str keys, >64-bit ints, datetimes,
+    dataclasses), and whenever the caller sets encoder options (indent, sort_keys, separators, default, etc.).
+    Known differences from the stdlib: NaN and +/-Infinity encode as null (the stdlib's bare NaN isn't valid JSON, and
+    MySQL's JSON column rejects it), UUIDs and Enums are serialized rather than rejected, and the output is compact
+    UTF-8 rather than spaced and \\u-escaped, which parses to the same value.
+    """
+
+    def uses_default_options(self) -> bool:
+        """
+        Returns True when this encoder was built with json.dumps()'s default options and no `default` callable.
+        Called by: encode()
+        """
+        options: dict[str, object] = {name: getattr(self, name) for name in DEFAULT_ENCODER_OPTIONS}
+        return options == DEFAULT_ENCODER_OPTIONS and 'default' not in vars(self)
+
+    def encode(self, o: object) -> str:
+        """
+        Serializes `o` to a JSON string.
+        Called by: json.dumps()
+        """
+        encoded: str | None = None
+        if self.uses_default_options():
+            try:
+                encoded = orjson.dumps(o, option=ORJSON_ENCODE_OPTIONS).decode('utf-8')
+            except orjson.JSONEncodeError:
+                pass
+        if encoded is None:
+            encoded = super().encode(o)
+        return encoded
+
+
+class OrjsonJSONDecoder(json.JSONDecoder):
+    """
+    JSONDecoder whose decode() parses with orjson.
+    Django's JSONField calls `json.loads(value, cls=decoder)` when loading rows, which lands here.
+    Falls back to the stdlib decoder for input orjson rejects (e.g. NaN, >64-bit ints), so behavior is unchanged.
+    """
+
+    def decode(self, s: str) -> object:
+        """
+        Parses the JSON string `s`.
+        Called by: json.loads()
+        """
+        try:
+            decoded: object = orjson.loads(s)
+        except orjson.JSONDecodeError:
+            decoded = super().decode(s)
+        return decoded
@@ -2,22 +2,57 @@
 Helper functions for rendering markdown content.
 """
 
+import functools
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import markdown
+import orjson
+
+if TYPE_CHECKING:
+    import markdown
+
+## Markdown instances hold per-conversion state, so each thread gets its own reusable converter
+_thread_local = threading.local()
+
+
+def get_markdown_converter() -> 'markdown.Markdown':
+    """
+    Returns this thread's Markdown converter, building it (extensions and all) on first use.
+    `markdown` is imported here rather than at module load, so workers that never render markdown skip its import cost.
+    """
+    converter = getattr(_thread_local, 'converter', None)
+    if converter is None:
+        import markdown
+
+        converter = markdown.Markdown(extensions=['extra'], output_format='html5')
+        _thread_local.converter = converter
+    return converter
 
 
 def render_markdown_text(text: str) -> str:
     """
     Renders markdown text to HTML.
     """
-    html: str = markdown.markdown(text, extensions=['extra'], output_format='html5')
+    converter = get_markdown_converter()
+    html: str = converter.reset().convert(text)
     return html
 
 
 def load_markdown_file(file_path: Path) -> str:
     """
     Loads a markdown file from disk and renders it to HTML.
+    Rendered HTML is cached until the file's modification time changes.
+    """
+    mtime_ns: int = file_path.stat().st_mtime_ns
+    html: str = render_markdown_file_cached(file_path, mtime_ns)
+    return html
+
+
+@functools.lru_cache(maxsize=32)
+def render_markdown_file_cached(file_path: Path, mtime_ns: int) -> str:
+    """
+    Reads and renders a markdown file; `mtime_ns` is part of the cache key so edits are picked up.
     """
     markdown_text: str = file_path.read_text(encoding='utf-8')
     html: str = render_markdown_text(markdown_text)
@@ -32,3 +67,27 @@ def load_markdown_from_lib(filename: str) -> str:
     file_path: Path = lib_dir / filename
     html: str = load_markdown_file(file_path)
     return html
+
+
+def build_info_context(info_html: str) -> dict[str, str]:
+    """
+    Builds the info page's payload, shared by its template and json responses.
+    Called by:
+        - pdf_checker_app.views.info()
+        - build_info_json()
+    """
+    context: dict[str, str] = {
+        'foo': 'bar',
+        'info_html': info_html,
+    }
+    return context
+
+
+@functools.lru_cache(maxsize=1)
+def build_info_json(info_html: str) -> bytes:
+    """
+    Serializes the info page's json response body.
+    Keyed on the rendered info html (itself cached until info.md changes), so the dump runs once per edit, not per hit.
+    Called by: pdf_checker_app.views.info()
+    """
+    return orjson.dumps(build_info_context(info_html), option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
@@ -6,96 +6,224 @@ Called by:
     - scripts.process_openrouter_summaries (cron background processing)
 """
 
-import json
+import atexit
+import functools
 import logging
-from datetime import datetime, timezone
+import random
+import threading
+import time
+from collections.abc import Sequence
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import httpx
+import orjson
 from django.conf import settings as project_settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils import timezone as django_timezone
 
 from pdf_checker_app.models import OpenRouterSummary
 
+if TYPE_CHECKING:
+    import httpx
+
 log = logging.getLogger(__name__)
 
 OPENROUTER_API_URL = 'https://openrouter.ai/api/v1/chat/completions'
 
+## Sent on every OpenRouter request, so they're set once on the shared client; the API key is added per call
+OPENROUTER_CLIENT_HEADERS: dict[str, str] = {
+    'Content-Type': 'application/json',
+    'HTTP-Referer': 'https://library.brown.edu',
+    'X-Title': 'PDF Accessibility Checker',
+}
+
 PROMPT_FILE_PATH = Path(__file__).resolve().parent / 'prompt.md'
+PROMPT_PLACEHOLDER = '{verapdf_json_output}'
+
+## Account-level failures (bad key, no credits, forbidden); every model would fail the same way, so don't fall back
+NON_RETRYABLE_STATUS_CODES: frozenset[int] = frozenset({401, 402, 403})
+
+## Transient failures (rate limit, provider overload/outage) worth retrying after a short wait
+RETRYABLE_STATUS_CODES: frozenset[int] = frozenset({429, 500, 502, 503, 504, 529})
+OPENROUTER_MAX_ATTEMPTS = 5
+OPENROUTER_MAX_RETRY_WAIT_SECONDS = 60.0  # cap on any single wait, including a server-sent Retry-After
+OPENROUTER_MIN_RETRY_TIMEOUT_SECONDS = 5.0  # don't retry if less than this per-model timeout would be left
+
+## Shared OpenRouter clients, keyed by the `verify` value, so TLS setup and connections are reused across calls
+_HTTP_CLIENTS: dict[str | bool, 'httpx.Client'] = {}
+_HTTP_CLIENTS_LOCK = threading.Lock()  # cron worker threads may make their first call at the same time
 
 
 def load_prompt_template() -> str:
     """
     Loads the OpenRouter prompt template from disk.
+    Cached until the file's modification time changes, so repeat calls cost one stat().
+    """
+    mtime_ns: int = PROMPT_FILE_PATH.stat().st_mtime_ns
+    prompt_text: str = read_prompt_template_cached(mtime_ns)
+    return prompt_text
+
+
+@functools.lru_cache(maxsize=1)
+def read_prompt_template_cached(mtime_ns: int) -> str:
+    """
+    Reads the prompt template; `mtime_ns` is part of the cache key so edits are picked up.
     """
     prompt_text = PROMPT_FILE_PATH.read_text(encoding='utf-8')
     return prompt_text
 
 
+def get_prompt_parts() -> tuple[str, str]:
+    """
+    Returns the prompt template split around its single placeholder, as (prefix, suffix).
+    build_prompt() concatenates instead of running str.format() on every call.
+    """
+    return split_prompt_template(load_prompt_template())
+
+
+@functools.lru_cache(maxsize=1)
+def split_prompt_template(prompt_template: str) -> tuple[str, str]:
+    """
+    Splits a prompt template around PROMPT_PLACEHOLDER; cached per template text.
+    """
+    prefix, placeholder, suffix = prompt_template.partition(PROMPT_PLACEHOLDER)
+    if not placeholder:
+        raise ValueError(f'Prompt template {PROMPT_FILE_PATH} is missing the {PROMPT_PLACEHOLDER} placeholder')
+    return (prefix, suffix)
+
+
+@functools.lru_cache(maxsize=1)
 def get_api_key() -> str:
     """
     Retrieves the OpenRouter API key from environment.
+    Cached; the setting doesn't change during the process lifetime.
     """
     return project_settings.OPENROUTER_API_KEY
 
 
-def get_model_order() -> list[str]:
+@functools.lru_cache(maxsize=1)
+def get_system_ca_bundle() -> str:
+    """
+    Retrieves the optional SYSTEM_CA_BUNDLE path from environment ('' when unset).
+    Cached; the setting doesn't change during the process lifetime.
+    """
+    return project_settings.SYSTEM_CA_BUNDLE
+
+
+@functools.lru_cache(maxsize=1)
+def get_model_order() -> tuple[str, ...]:
     """
     Retrieves the OpenRouter model order from environment.
+    Cached as an immutable tuple; the setting doesn't change during the process lifetime.
+    """
+    return tuple(project_settings.OPENROUTER_MODEL_ORDER)
+
+
+@receiver(setting_changed)
+def clear_settings_caches(setting: str, **kwargs) -> None:
+    """
+    Clears the cached settings accessors when their setting changes (e.g. under override_settings in tests).
     """
-    return list(project_settings.OPENROUTER_MODEL_ORDER)
+    cached_accessors = {
+        'OPENROUTER_API_KEY': get_api_key,
+        'OPENROUTER_MODEL_ORDER': get_model_order,
+        'SYSTEM_CA_BUNDLE': get_system_ca_bundle,
+    }
+    if setting in cached_accessors:
+        cached_accessors[setting].cache_clear()
 
 
 def filter_down_failure_checks(raw_verapdf_json: dict) -> dict:
     """
     Filters down veraPDF JSON by keeping only one unique check per rule in 'checks' arrays.
+    Prunes in place and returns the same dict; callers pass a freshly-loaded `raw_json` that is not saved back.
+    With DEBUG logging on, logs the serialized size before and after, as evidence for any further prompt trimming;
+    the extra serializations are skipped otherwise.
+    """
+    debug: bool = log.isEnabledFor(logging.DEBUG)
+    original_size: int = len(orjson.dumps(raw_verapdf_json)) if debug else 0
+    prune_checks_in_place(raw_verapdf_json)
+    if debug:
+        pruned_size: int = len(orjson.dumps(raw_verapdf_json))
+        log.debug(
+            'pruned veraPDF JSON from %s to %s bytes (%.1f%% kept)',
+            original_size,
+            pruned_size,
+            100.0 * pruned_size / original_size if original_size else 100.0,
+        )
+    return raw_verapdf_json
+
+
+def prune_checks_in_place(root: object) -> None:
+    """
+    Walks the JSON with an explicit stack, truncating 'checks' arrays in place to one representative check.
+    Kept checks are not descended into.
     """
-    return prune_checks_recursive(raw_verapdf_json)
+    stack: list[object] = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, child in node.items():
+                if key == 'checks' and isinstance(child, list):
+                    del child[1:]
+                elif isinstance(child, (dict, list)):
+                    stack.append(child)
+        elif isinstance(node, list):
+            stack.extend(child for child in node if isinstance(child, (dict, list)))
 
 
-def prune_checks_recursive(value: object) -> object:
+def build_prompt(verapdf_json: dict) -> str:
     """
-    Recursively processes the JSON, keeping one unique check per rule in 'checks' arrays.
+    Builds the prompt for OpenRouter based on veraPDF results.
+    The JSON is embedded compact; indentation roughly doubles the prompt's tokens and the model doesn't need it.
     """
-    pruned: object = value
+    verapdf_json_str = orjson.dumps(verapdf_json).decode('utf-8')
+    prompt_prefix, prompt_suffix = get_prompt_parts()
+    prompt = prompt_prefix + verapdf_json_str + prompt_suffix
+    ## Lazy %-style args, so nothing is formatted unless DEBUG is emitted; the full prompt is persisted on the summary
+    log.debug('prompt (%s chars), ``%.2048s``', len(prompt), prompt)
+    return prompt
 
-    if isinstance(value, dict):
-        new_dict: dict[str, object] = {}
-        for key, child in value.items():
-            if key == 'checks' and isinstance(child, list):
-                new_dict[key] = filter_unique_checks(child)
-            else:
-                new_dict[key] = prune_checks_recursive(child)
-        pruned = new_dict
 
-    elif isinstance(value, list):
-        new_list: list[object] = []
-        for child in value:
-            new_list.append(prune_checks_recursive(child))
-        pruned = new_list
+def get_http_client() -> 'httpx.Client':
+    """
+    Returns the shared OpenRouter HTTP client, creating it on first use (under a lock, so threads share one client).
+    HTTP/2 lets a single TLS connection be multiplexed across requests (e.g. a cron batch of summaries).
+    `httpx` is imported here rather than at module load, so processes that never call OpenRouter skip its import cost.
 
-    return pruned
+    Note: Only one of our servers requires a non-default certificate to be specified,
+          so the SYSTEM_CA_BUNDLE environment variable is implemented optionally.
+    """
+    verify: str | bool = get_system_ca_bundle() or True
+    with _HTTP_CLIENTS_LOCK:
+        client = _HTTP_CLIENTS.get(verify)
+        if client is None:
+            import httpx
+
+            client = httpx.Client(
+                verify=verify,
+                headers=OPENROUTER_CLIENT_HEADERS,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=30.0),
+            )
+            _HTTP_CLIENTS[verify] = client
+    return client
 
 
-def filter_unique_checks(checks: list[object]) -> list[object]:
+def close_http_clients() -> None:
     """
-    Filters a checks array to keep only one representative check.
+    Closes and forgets the shared OpenRouter HTTP clients.
+    Registered with atexit.
     """
-    result: list[object] = []
-    if len(checks) > 0:
-        result = [checks[0]]
-    return result
+    with _HTTP_CLIENTS_LOCK:
+        while _HTTP_CLIENTS:
+            _verify, client = _HTTP_CLIENTS.popitem()
+            client.close()
 
 
-def build_prompt(verapdf_json: dict) -> str:
-    """
-    Builds the prompt for OpenRouter based on veraPDF results.
-    """
-    verapdf_json_str = json.dumps(verapdf_json, indent=2)
-    prompt_template = load_prompt_template()
-    prompt = prompt_template.format(verapdf_json_output=verapdf_json_str)
-    log.debug(f'prompt, ``{prompt}``')
-    return prompt
+atexit.register(close_http_clients)
 
 
 def call_openrouter(prompt: str, api_key: str, model: str, timeout_seconds: float) -> dict:
@@ -106,38 +234,26 @@ def call_openrouter(prompt: str, api_key: str, model: str, timeout_seconds: floa
     Raises:
         httpx.TimeoutException: If the request exceeds timeout_seconds.
         httpx.HTTPStatusError: If the API returns an error status.
-
-    Note: Only one of our servers requires a non-default certificate to be specified,
-          so the SYSTEM_CA_BUNDLE environment variable is implemented optionally.
     """
-    headers = {
-        'Authorization': f'Bearer {api_key}',
-        'Content-Type': 'application/json',
-        'HTTP-Referer': 'https://library.brown.edu',
-        'X-Title': 'PDF Accessibility Checker',
-    }
-
-    payload = {'model': model, 'messages': [{'role': 'user', 'content': prompt}]}
-
-    client_kwargs = {'timeout': timeout_seconds}
-    system_ca_bundle = project_settings.SYSTEM_CA_BUNDLE
-    if system_ca_bundle:
-        client_kwargs['verify'] = system_ca_bundle
-
-    with httpx.Client(**client_kwargs) as client:
-        response = client.post(OPENROUTER_API_URL, headers=headers, json=payload)
-        log.debug(f'response, ``{response}``')
-        if response.is_error:
-            log.error(
-                'OpenRouter request failed with status=%s, model=%s, response=%s',
-                response.status_code,
-                model,
-                response.text,
-            )
-        response.raise_for_status()
-        jsn_response = response.json()
-        log.debug(f'jsn_response, ``{jsn_response}``')
-        return jsn_response
+    headers = {'Authorization': f'Bearer {api_key}'}  # merged over the client's OPENROUTER_CLIENT_HEADERS
+
+    ## Pre-serialize with orjson; httpx's `json=` would run the multi-MB prompt through stdlib json.dumps()
+    payload = orjson.dumps({'model': model, 'messages': [{'role': 'user', 'content': prompt}]})
+
+    client = get_http_client()
+    response = client.post(OPENROUTER_API_URL, headers=headers, content=payload, timeout=timeout_seconds)
+    log.debug('response, ``%s``', response)
+    if response.is_error:
+        log.error(
+            'OpenRouter request failed with status=%s, model=%s, response=%s',
+            response.status_code,
+            model,
+            response.text,
+        )
+    response.raise_for_status()
+    jsn_response = response.json()
+    log.debug('jsn_response, ``%s``', jsn_response)
+    return jsn_response
 
     ## end def call_openrouter()
 
@@ -145,12 +261,15 @@ def call_openrouter(prompt: str, api_key: str, model: str, timeout_seconds: floa
 def call_openrouter_with_model_order(
     prompt: str,
     api_key: str,
-    model_order: list[str],
+    model_order: Sequence[str],
     timeout_seconds: float,
 ) -> dict:
     """
     Calls OpenRouter with models in the provided order until one succeeds.
+    Stops early on account-level errors (see NON_RETRYABLE_STATUS_CODES), since the next model would fail identically.
     """
+    import httpx
+
     last_exception: Exception | None = None
     response_json: dict = {}
     log.debug('OpenRouter model order: %s', model_order)
@@ -161,6 +280,14 @@ def call_openrouter_with_model_order(
             response_json = call_openrouter(prompt, api_key, model, timeout_seconds)
             last_exception = None
             break
+        except httpx.HTTPStatusError as exc:
+            last_exception = exc
+            if exc.response.status_code in NON_RETRYABLE_STATUS_CODES:
+                log.error(
+                    'OpenRouter returned status=%s for model=%s; not trying other models', exc.response.status_code, model
+                )
+                break
+            log.warning('OpenRouter call failed for model=%s, trying next if available', model)
         except Exception as exc:
             last_exception = exc
             log.warning('OpenRouter call failed for model=%s, trying next if available', model)
@@ -173,42 +300,93 @@ def call_openrouter_with_model_order(
     ## end def call_openrouter_with_model_order()
 
 
+def call_openrouter_with_retries(
+    prompt: str,
+    api_key: str,
+    model_order: Sequence[str],
+    timeout_seconds: float,
+    deadline_seconds: float,
+) -> dict:
+    """
+    Calls call_openrouter_with_model_order(), retrying transient failures (see RETRYABLE_STATUS_CODES, and connection
+    errors) after jittered, linearly growing waits, up to OPENROUTER_MAX_ATTEMPTS.
+    A longer `Retry-After` from the server is honored, up to OPENROUTER_MAX_RETRY_WAIT_SECONDS.
+    Each retry must finish within `deadline_seconds` of the first attempt: the wait plus a full pass over the model
+    order is fitted into what's left, by shortening the per-model timeout. Gives up, re-raising, once that per-model
+    timeout would drop below OPENROUTER_MIN_RETRY_TIMEOUT_SECONDS.
+
+    Called by:
+        - pdf_checker_app.lib.sync_processing_helpers.attempt_openrouter_sync()
+        - scripts.process_openrouter_summaries.process_single_summary()
+    """
+    import httpx
+
+    deadline = time.monotonic() + deadline_seconds
+    attempt = 1
+    attempt_timeout_seconds = timeout_seconds
+    while True:
+        try:
+            return call_openrouter_with_model_order(prompt, api_key, model_order, attempt_timeout_seconds)
+        except (httpx.HTTPStatusError, httpx.ConnectError) as exc:
+            is_status_error = isinstance(exc, httpx.HTTPStatusError)
+            if is_status_error and exc.response.status_code not in RETRYABLE_STATUS_CODES:
+                raise
+            if attempt >= OPENROUTER_MAX_ATTEMPTS:
+                raise
+            retry_after_seconds = get_retry_after_seconds(exc.response) if is_status_error else 0.0
+            wait_seconds = max(random.uniform(2.0, 4.0) * attempt, retry_after_seconds)
+            wait_seconds = min(wait_seconds, OPENROUTER_MAX_RETRY_WAIT_SECONDS)
+            ## The next attempt may time out on every model in turn; give each an equal share of the time left
+            remaining_seconds = deadline - time.monotonic() - wait_seconds
+            attempt_timeout_seconds = min(timeout_seconds, remaining_seconds / max(1, len(model_order)))
+            if attempt_timeout_seconds < OPENROUTER_MIN_RETRY_TIMEOUT_SECONDS:
+                raise
+            failure = exc.response.status_code if is_status_error else type(exc).__name__
+        log.warning('OpenRouter attempt %s failed with %s; retrying in %.1fs', attempt, failure, wait_seconds)
+        time.sleep(wait_seconds)
+        attempt += 1
+
+    ## end def call_openrouter_with_retries()
+
+
+def get_retry_after_seconds(response: 'httpx.Response') -> float:
+    """
+    Returns the wait a `Retry-After: <seconds>` header asks for, or 0.0 if it's absent or not in seconds.
+    (The HTTP-date form isn't sent by OpenRouter, so it's treated as absent.)
+    """
+    try:
+        return max(0.0, float(response.headers.get('Retry-After', '')))
+    except ValueError:
+        return 0.0
+
+
 def parse_openrouter_response(response_json: dict) -> dict:
     """
     Parses the OpenRouter response and extracts relevant fields.
     """
-    result = {
-        'summary_text': '',
-        'openrouter_response_id': response_json.get('id', ''),
-        'provider': response_json.get('provider', ''),
-        'model': response_json.get('model', ''),
-        'finish_reason': '',
-        'openrouter_created_at': None,
-        'prompt_tokens': None,
-        'completion_tokens': None,
-        'total_tokens': None,
-    }
-
-    ## Extract summary text from choices
-    choices = response_json.get('choices', [])
-    if choices:
-        choice = choices[0]
-        message = choice.get('message', {})
-        result['summary_text'] = message.get('content', '')
-        result['finish_reason'] = choice.get('finish_reason', '')
+    ## Extract summary text from choices; `or {}` also covers keys present with a null value
+    choices = response_json.get('choices')
+    choice = (choices[0] if choices else None) or {}
+    message = choice.get('message') or {}
 
     ## Extract usage info
-    usage = response_json.get('usage', {})
-    result['prompt_tokens'] = usage.get('prompt_tokens')
-    result['completion_tokens'] = usage.get('completion_tokens')
-    result['total_tokens'] = usage.get('total_tokens')
+    usage = response_json.get('usage') or {}
 
-    ## Extract created timestamp
+    ## Extract created timestamp; `fromtimestamp()` gives naive local time directly, matching the USE_TZ=False storage
     created = response_json.get('created')
-    if created:
-        utc_dt = datetime.fromtimestamp(created, tz=timezone.utc)
-        result['openrouter_created_at'] = django_timezone.make_naive(utc_dt)
+    openrouter_created_at = datetime.fromtimestamp(created) if created else None
 
+    result = {
+        'summary_text': message.get('content', ''),
+        'openrouter_response_id': response_json.get('id', ''),
+        'provider': response_json.get('provider', ''),
+        'model': response_json.get('model', ''),
+        'finish_reason': choice.get('finish_reason', ''),
+        'openrouter_created_at': openrouter_created_at,
+        'prompt_tokens': usage.get('prompt_tokens'),
+        'completion_tokens': usage.get('completion_tokens'),
+        'total_tokens': usage.get('total_tokens'),
+    }
     return result
 
     ## end def parse_openrouter_response()
@@ -228,9 +406,23 @@ def persist_openrouter_summary(summary: OpenRouterSummary, response_json: dict,
     summary.prompt_tokens = parsed['prompt_tokens']
     summary.completion_tokens = parsed['completion_tokens']
     summary.total_tokens = parsed['total_tokens']
-    utc_now = datetime.now(tz=timezone.utc)
-    naive_now = django_timezone.make_naive(utc_now)
     summary.status = 'completed'
-    summary.completed_at = naive_now
+    summary.completed_at = django_timezone.now()  # naive local time, since USE_TZ=False
     summary.error = None
-    summary.save()
+    summary.save(
+        update_fields=[
+            'raw_response_json',
+            'summary_text',
+            'openrouter_response_id',
+            'provider',
+            'model',
+            'finish_reason',
+            'openrouter_created_at',
+            'prompt_tokens',
+            'completion_tokens',
+            'total_tokens',
+            'status',
+            'completed_at',
+            'error',
+        ]
+    )
@@ -8,12 +8,14 @@ Called by:
 """
 
 import hashlib
-import json
 import logging
+import os
 import subprocess
+import tempfile
 import uuid
 from pathlib import Path
 
+import orjson
 from django.conf import settings as project_settings
 from django.core.files.uploadedfile import UploadedFile
 
@@ -21,6 +23,9 @@ from pdf_checker_app.models import VeraPDFResult
 
 log = logging.getLogger(__name__)
 
+## Placeholder directory shown in reports in place of the real upload path
+VERAPDF_ITEM_NAME_PREFIX = '/path/to/pdf_uploads/'
+
 
 class VeraPDFTimeoutError(Exception):
     """
@@ -36,27 +41,43 @@ def get_shibboleth_user_info(request) -> dict[str, str | list[str]]:
     """
     ## These header names may vary depending on your Shibboleth configuration
     ## Adjust as needed based on your Shibboleth SP configuration
+    meta = request.META
+    groups: str = meta.get('HTTP_SHIB_GROUPS', '')
     return {
-        'first_name': request.META.get('HTTP_SHIB_GIVEN_NAME', ''),
-        'last_name': request.META.get('HTTP_SHIB_SN', ''),
-        'email': request.META.get('HTTP_SHIB_MAIL', ''),
-        'groups': request.META.get('HTTP_SHIB_GROUPS', '').split(';') if request.META.get('HTTP_SHIB_GROUPS') else [],
+        'first_name': meta.get('HTTP_SHIB_GIVEN_NAME', ''),
+        'last_name': meta.get('HTTP_SHIB_SN', ''),
+        'email': meta.get('HTTP_SHIB_MAIL', ''),
+        'groups': groups.split(';') if groups else [],
     }
 
 
 def generate_checksum(file: UploadedFile) -> str:
     """
     Generates SHA-256 checksum for uploaded file.
+    Uses hashlib.file_digest(), which runs the read/hash loop in C (and hashes an in-memory upload's buffer directly).
     """
-    sha256_hash = hashlib.sha256()
-    for chunk in file.chunks():
-        sha256_hash.update(chunk)
+    file.seek(0)
+    sha256_hash = hashlib.file_digest(file.file, 'sha256')
+    file.seek(0)
     return sha256_hash.hexdigest()
 
 
+def is_saved_upload(upload_pdf_path: Path, size: int) -> bool:
+    """
+    Returns True when `upload_pdf_path` already exists with the expected size; the checksum name vouches for content.
+    Called by:
+        - save_pdf_file()
+    """
+    try:
+        return upload_pdf_path.stat().st_size == size
+    except FileNotFoundError:
+        return False
+
+
 def save_pdf_file(file: UploadedFile, checksum: str) -> Path:
     """
     Saves uploaded file to temporary storage.
+    Skips the copy when a same-sized file for this checksum is already on disk.
     Called by:
         - pdf_checker_app.views.upload_pdf()
     """
@@ -64,10 +85,12 @@ def save_pdf_file(file: UploadedFile, checksum: str) -> Path:
     absolute_upload_dir_path = upload_dir_path.resolve()
     absolute_upload_dir_path.mkdir(parents=True, exist_ok=True)
     upload_pdf_path = absolute_upload_dir_path / f'{checksum}.pdf'
-
-    with open(upload_pdf_path, 'wb') as dest:
-        for chunk in file.chunks():
-            dest.write(chunk)
+    if not is_saved_upload(upload_pdf_path, file.size):
+        with open(upload_pdf_path, 'wb') as dest:
+            for chunk in file.chunks():
+                dest.write(chunk)
+    else:
+        log.debug('``%s`` already saved; skipping copy', upload_pdf_path)
 
     return upload_pdf_path
 
@@ -89,9 +112,9 @@ def save_pdf_file(file: UploadedFile, checksum: str) -> Path:
 #     return temp_path
 
 
-def run_verapdf(pdf_path: Path, verapdf_cli_path: Path, timeout_seconds: float | None = None) -> str:
+def run_verapdf(pdf_path: Path, verapdf_cli_path: Path, timeout_seconds: float | None = None) -> bytes:
     """
-    Runs veraPDF on a temporary file and returns the raw-json-output.
+    Runs veraPDF on a temporary file and returns the raw-json-output, as undecoded bytes (orjson parses bytes directly).
     Called by:
         - pdf_checker_app.lib.sync_processing_helpers.attempt_verapdf_sync()
         - scripts.process_verapdf_jobs.process_single_job()
@@ -119,29 +142,33 @@ def run_verapdf(pdf_path: Path, verapdf_cli_path: Path, timeout_seconds: float |
         str(pdf_path),
     ]
     ## run command --------------------------------------------------
-    try:
-        completed_process = subprocess.run(
-            command,
-            cwd='.',
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
-        )
-        output = str(completed_process.stdout)
-        log.debug(f'output, ``{output}``')
-        return output
-    except subprocess.TimeoutExpired as e:
-        log.warning(f'veraPDF timed out after {timeout_seconds} seconds for {pdf_path}')
-        raise VeraPDFTimeoutError(f'veraPDF execution exceeded {timeout_seconds} seconds') from e
-
-
-def parse_verapdf_output(raw_output: str) -> dict[str, object]:
+    ## stdout goes straight to an unnamed temp file, then is read back in one exact-size read;
+    ## piping it would buffer the (possibly very large) output in chunks and join them, briefly holding it twice
+    with tempfile.TemporaryFile() as stdout_file:
+        try:
+            subprocess.run(
+                command,
+                cwd='.',
+                stdout=stdout_file,
+                stderr=subprocess.PIPE,
+                timeout=timeout_seconds,
+            )
+        except subprocess.TimeoutExpired as e:
+            log.warning('veraPDF timed out after %s seconds for %s', timeout_seconds, pdf_path)
+            raise VeraPDFTimeoutError(f'veraPDF execution exceeded {timeout_seconds} seconds') from e
+        stdout_file.seek(0)
+        output: bytes = stdout_file.read()
+    log.debug('output length, ``%d`` bytes', len(output))
+    return output
+
+
+def parse_verapdf_output(raw_output: bytes | str) -> dict[str, object]:
     """
-    Parses the raw veraPDF JSON output into a Python dictionary.
+    Parses the raw veraPDF JSON output (bytes from run_verapdf(), or str) into a Python dictionary.
 
     """
     log.debug('starting parse_verapdf_output()')
-    parsed_output = json.loads(raw_output)
+    parsed_output = orjson.loads(raw_output)
     if not isinstance(parsed_output, dict):
         raise ValueError('veraPDF output is not a JSON object.')
     overwrite_verapdf_job_item_names(parsed_output)
@@ -156,34 +183,17 @@ def get_verapdf_compliant(raw_json: dict[str, object]) -> bool | None:
         - get_accessibility_assessment()
     """
     log.debug('starting get_verapdf_compliant()')
-    result: bool | None = None
     report_obj: object | None = raw_json.get('report')
-    report: dict[str, object]
-    if isinstance(report_obj, dict):
-        report = report_obj
-    else:
-        report = raw_json
-
-    jobs_obj: object | None = report.get('jobs')
-    if isinstance(jobs_obj, list) and jobs_obj:
-        jobs: list[object] = jobs_obj
+    report: object = report_obj if isinstance(report_obj, dict) else raw_json
 
-        job0_obj: object = jobs[0]
-        if isinstance(job0_obj, dict):
-            job0: dict[str, object] = job0_obj
-
-            validation_result_obj: object | None = job0.get('validationResult')
-            if isinstance(validation_result_obj, list) and validation_result_obj:
-                validation_result: list[object] = validation_result_obj
-
-                validation_result0_obj: object = validation_result[0]
-                if isinstance(validation_result0_obj, dict):
-                    validation_result0: dict[str, object] = validation_result0_obj
+    ## EAFP: well-formed output takes the straight path; any shape mismatch means "unknown"
+    try:
+        compliant: object | None = report['jobs'][0]['validationResult'][0]['compliant']
+    except (KeyError, IndexError, TypeError):
+        compliant = None
 
-                    compliant: object | None = validation_result0.get('compliant')
-                    if isinstance(compliant, bool):
-                        result = compliant
-    log.debug(f'result: ``{result}``')
+    result: bool | None = compliant if isinstance(compliant, bool) else None
+    log.debug('result: ``%s``', result)
     return result
 
 
@@ -223,32 +233,49 @@ def overwrite_verapdf_job_item_names(raw_json: dict[str, object]) -> None:
         return
 
     for job in jobs:
-        if not isinstance(job, dict):
-            continue
-
-        item_details = job.get('itemDetails')
-        if not isinstance(item_details, dict):
+        try:
+            item_details = job['itemDetails']
+            name = item_details['name']
+        except (KeyError, TypeError):
             continue
-
-        name = item_details.get('name')
         if not isinstance(name, str):
             continue
 
-        new_name = f'/path/to/pdf_uploads/{Path(name).name}'
-        log.debug(f'overwriting veraPDF item name from ``{name}`` to ``{new_name}``')
+        new_name = VERAPDF_ITEM_NAME_PREFIX + os.path.basename(name)
+        log.debug('overwriting veraPDF item name from ``%s`` to ``%s``', name, new_name)
         item_details['name'] = new_name
 
 
+def format_verapdf_json(raw_json: object) -> str:
+    """
+    Returns the indented display form of veraPDF JSON.
+
+    Called by:
+        - save_verapdf_result()
+        - pdf_checker_app.views.view_report()
+        - pdf_checker_app.views.verapdf_fragment()
+    """
+    return orjson.dumps(raw_json, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+
 def save_verapdf_result(document_id: uuid.UUID, raw_json: dict[str, object]) -> VeraPDFResult:
     """
     Persists raw veraPDF JSON output for a document.
+    On re-runs, the existing row is looked up without its large raw_json columns, which are then overwritten.
+    The indented display form is stored alongside, so report views don't re-serialize it per request.
+
+    Called by:
+        - pdf_checker_app.lib.sync_processing_helpers.attempt_verapdf_sync()
+        - scripts.process_verapdf_jobs.process_single_job()
     """
     compliant = get_verapdf_compliant(raw_json)
     is_accessible = compliant if compliant is not None else False
-    result, created = VeraPDFResult.objects.get_or_create(
+    raw_json_pretty = format_verapdf_json(raw_json)
+    result, created = VeraPDFResult.objects.defer('raw_json', 'raw_json_pretty').get_or_create(
         pdf_document_id=document_id,
         defaults={
             'raw_json': raw_json,
+            'raw_json_pretty': raw_json_pretty,
             'is_accessible': is_accessible,
             'validation_profile': 'PDF/UA-1',
             'verapdf_version': 'unknown',
@@ -256,6 +283,7 @@ def save_verapdf_result(document_id: uuid.UUID, raw_json: dict[str, object]) ->
     )
     if not created:  # exists; will overwrite
         result.raw_json = raw_json
+        result.raw_json_pretty = raw_json_pretty
         result.is_accessible = is_accessible
-        result.save(update_fields=['raw_json', 'is_accessible'])
+        result.save(update_fields=['raw_json', 'raw_json_pretty', 'is_accessible'])
     return result
@@ -6,12 +6,11 @@ Called by:
     - pdf_checker_app.views.upload_pdf()
 """
 
-import datetime
 import logging
 from pathlib import Path
 
-import httpx
 from django.conf import settings as project_settings
+from django.db import transaction
 from django.utils import timezone as django_timezone
 
 from pdf_checker_app.lib import openrouter_helpers, pdf_helpers
@@ -21,16 +20,30 @@ from pdf_checker_app.models import OpenRouterSummary, PDFDocument, VeraPDFResult
 log = logging.getLogger(__name__)
 
 
+def update_document_status(doc: PDFDocument, **fields: object) -> None:
+    """
+    Sets processing fields on `doc` in place and writes just those columns with one queryset UPDATE.
+    Called by:
+        - attempt_synchronous_processing()
+        - attempt_verapdf_sync()
+    """
+    for name, value in fields.items():
+        setattr(doc, name, value)
+    PDFDocument.objects.filter(pk=doc.pk).update(**fields)
+
+
 def attempt_synchronous_processing(doc: PDFDocument, pdf_path: Path) -> None:
     """
     Attempts to run veraPDF and OpenRouter synchronously with timeouts.
     Updates doc status in-place. Falls back to 'pending' on timeout.
     """
     ## Mark as processing and set timestamp
-    doc.processing_status = 'processing'
-    doc.processing_error = None
-    doc.processing_started_at = datetime.datetime.now()
-    doc.save(update_fields=['processing_status', 'processing_error', 'processing_started_at'])
+    update_document_status(
+        doc,
+        processing_status='processing',
+        processing_error=None,
+        processing_started_at=django_timezone.now(),  # naive local time, since USE_TZ=False
+    )
 
     ## Attempt veraPDF with timeout
     verapdf_success = attempt_verapdf_sync(doc, pdf_path)
@@ -38,13 +51,20 @@ def attempt_synchronous_processing(doc: PDFDocument, pdf_path: Path) -> None:
     if not verapdf_success:
         return
 
-    ## If veraPDF succeeded, attempt OpenRouter
-    verapdf_result = VeraPDFResult.objects.get(pdf_document=doc)
+    ## If veraPDF succeeded, attempt OpenRouter; only is_accessible is loaded here, so the accessible (skip) path
+    ## never reads the large raw_json -- attempt_openrouter_sync() fetches it with its own query when it's needed
+    verapdf_result = VeraPDFResult.objects.only('is_accessible').get(pdf_document_id=doc.id)
     if verapdf_result.is_accessible:
         log.info(f'Skipping OpenRouter for accessible document {doc.pk}')
         return
 
-    attempt_openrouter_sync(doc)
+    if not project_settings.OPENROUTER_SYNC_ENABLED:
+        ## Leave the slow LLM call to the cron script, so the upload request isn't held open for it
+        OpenRouterSummary.objects.get_or_create(pdf_document=doc, defaults={'status': 'pending'})
+        log.info(f'Sync OpenRouter disabled; queued summary for cron for document {doc.pk}')
+        return
+
+    attempt_openrouter_sync(doc, verapdf_result)
 
 
 def attempt_verapdf_sync(doc: PDFDocument, pdf_path: Path) -> bool:
@@ -59,32 +79,27 @@ def attempt_verapdf_sync(doc: PDFDocument, pdf_path: Path) -> bool:
         log.info(f'Attempting synchronous veraPDF for document {doc.pk}')
         raw_output = pdf_helpers.run_verapdf(pdf_path, verapdf_path, timeout_seconds=timeout_seconds)
         parsed_output = pdf_helpers.parse_verapdf_output(raw_output)
-        pdf_helpers.save_verapdf_result(doc.id, parsed_output)
-
-        doc.processing_status = 'completed'
-        doc.processing_error = None
-        doc.save(update_fields=['processing_status', 'processing_error'])
+        with transaction.atomic():  # result and 'completed' status land together, in one commit
+            pdf_helpers.save_verapdf_result(doc.id, parsed_output)
+            update_document_status(doc, processing_status='completed', processing_error=None)
         log.info(f'Synchronous veraPDF succeeded for document {doc.pk}')
         return True
 
     except VeraPDFTimeoutError:
         log.warning(f'veraPDF timed out for document {doc.pk}, falling back to cron')
-        doc.processing_status = 'pending'
-        doc.processing_started_at = None
-        doc.save(update_fields=['processing_status', 'processing_started_at'])
+        update_document_status(doc, processing_status='pending', processing_started_at=None)
         return False
 
     except Exception as exc:
         log.exception(f'veraPDF failed for document {doc.pk}')
-        doc.processing_status = 'failed'
-        doc.processing_error = str(exc)
-        doc.save(update_fields=['processing_status', 'processing_error'])
+        update_document_status(doc, processing_status='failed', processing_error=str(exc))
         return False
 
 
-def attempt_openrouter_sync(doc: PDFDocument) -> bool:
+def attempt_openrouter_sync(doc: PDFDocument, verapdf_result: VeraPDFResult) -> bool:
     """
-    Attempts synchronous OpenRouter summary generation with timeout.
+    Attempts synchronous OpenRouter summary generation with timeout, from the document's already-fetched veraPDF result.
+    If raw_json was deferred by the caller, it's fetched here with one extra query.
     Returns True if successful, False if timeout or error.
     """
     api_key = openrouter_helpers.get_api_key()
@@ -96,59 +111,59 @@ def attempt_openrouter_sync(doc: PDFDocument) -> bool:
 
     timeout_seconds = project_settings.OPENROUTER_SYNC_TIMEOUT_SECONDS
 
-    ## Create summary record with 'processing' status BEFORE calling API
-    utc_now = datetime.datetime.now(tz=datetime.timezone.utc)
-    naive_now = django_timezone.make_naive(utc_now)
-    summary, created = OpenRouterSummary.objects.get_or_create(
-        pdf_document=doc,
-        defaults={'status': 'processing', 'requested_at': naive_now},
-    )
-
-    if not created:
-        summary.status = 'processing'
-        summary.requested_at = naive_now
-        summary.error = None
-        summary.save(update_fields=['status', 'requested_at', 'error'])
+    ## Deferred import; only needed once an OpenRouter call is actually attempted
+    import httpx
 
+    ## Prune and build prompt first, so it's written along with the 'processing' status in a single query
+    prompt: str | None = None
     try:
-        log.info(f'Attempting synchronous OpenRouter for document {doc.pk}')
-
-        ## Get veraPDF result
-        verapdf_result = VeraPDFResult.objects.get(pdf_document=doc)
-        raw_verapdf_json = verapdf_result.raw_json
-
-        ## Prune and build prompt
-        verapdf_json = openrouter_helpers.filter_down_failure_checks(raw_verapdf_json)
+        if 'raw_json' in verapdf_result.get_deferred_fields():
+            ## The caller loaded only is_accessible; fetch raw_json explicitly rather than via a lazy attribute load
+            verapdf_result.refresh_from_db(fields=['raw_json'])
+        verapdf_json = openrouter_helpers.filter_down_failure_checks(verapdf_result.raw_json)
         prompt = openrouter_helpers.build_prompt(verapdf_json)
-
-        ## Save prompt
-        summary.prompt = prompt
-        summary.save(update_fields=['prompt'])
-
-        ## Call API with timeout
-        response_json = openrouter_helpers.call_openrouter_with_model_order(
-            prompt,
-            api_key,
-            model_order,
-            timeout_seconds,
+    except Exception as exc:
+        log.exception(f'Building the OpenRouter prompt failed for document {doc.pk}; leaving it for cron')
+        ## Record the failure (as the cron does), so the report shows it and the cron retries it
+        OpenRouterSummary.objects.update_or_create(pdf_document=doc, defaults={'status': 'failed', 'error': str(exc)})
+
+    success = False
+    if prompt is not None:
+        ## Create or reset the summary record with 'processing' status BEFORE calling API
+        ## (update_or_create locks an existing row, so concurrent retries of the same doc don't interleave)
+        summary, _created = OpenRouterSummary.objects.update_or_create(
+            pdf_document=doc,
+            defaults={'status': 'processing', 'requested_at': django_timezone.now(), 'error': None, 'prompt': prompt},
         )
-        parsed = openrouter_helpers.parse_openrouter_response(response_json)
-
-        ## Persist
-        openrouter_helpers.persist_openrouter_summary(summary, response_json, parsed)
-        log.info(f'Synchronous OpenRouter succeeded for document {doc.pk}')
-        return True
-
-    except httpx.TimeoutException:
-        log.warning(f'OpenRouter timed out for document {doc.pk}, falling back to cron')
-        summary.status = 'pending'
-        summary.error = 'Sync attempt timed out; will retry in background.'
-        summary.save(update_fields=['status', 'error'])
-        return False
 
-    except Exception as exc:
-        log.exception(f'OpenRouter failed for document {doc.pk}')
-        summary.status = 'failed'
-        summary.error = str(exc)
-        summary.save(update_fields=['status', 'error'])
-        return False
+        try:
+            log.info(f'Attempting synchronous OpenRouter for document {doc.pk}')
+
+            ## Call API with timeout; transient 429/5xx responses are retried while the sync time budget allows
+            response_json = openrouter_helpers.call_openrouter_with_retries(
+                prompt,
+                api_key,
+                model_order,
+                timeout_seconds,
+                deadline_seconds=timeout_seconds,
+            )
+            parsed = openrouter_helpers.parse_openrouter_response(response_json)
+
+            ## Persist
+            openrouter_helpers.persist_openrouter_summary(summary, response_json, parsed)
+            log.info(f'Synchronous OpenRouter succeeded for document {doc.pk}')
+            success = True
+
+        except httpx.TimeoutException:
+            log.warning(f'OpenRouter timed out for document {doc.pk}, falling back to cron')
+            summary.status = 'pending'
+            summary.error = 'Sync attempt timed out; will retry in background.'
+            summary.save(update_fields=['status', 'error'])
+
+        except Exception as exc:
+            log.exception(f'OpenRouter failed for document {doc.pk}')
+            summary.status = 'failed'
+            summary.error = str(exc)
+            summary.save(update_fields=['status', 'error'])
+
+    return success
@@ -1,9 +1,9 @@
 import datetime
+import functools
 import logging
 import pathlib
 import pprint
 
-import trio
 from django.conf import settings
 
 log = logging.getLogger(__name__)
@@ -34,6 +34,21 @@ def make_context(request, rq_now, info_txt):
     return context
 
 
+@functools.cache
+def get_branch_and_commit_text() -> str:
+    """
+    Returns `'{branch} {commit}'`, read once per process; a deploy restarts the workers, so it can't go stale.
+    `trio` is imported here rather than at module load, so worker boot doesn't pay for it.
+    Called by:
+        - views.version()
+    """
+    import trio
+
+    gatherer = GatherCommitAndBranchData()
+    trio.run(gatherer.manage_git_calls)
+    return f'{gatherer.branch} {gatherer.commit}'
+
+
 class GatherCommitAndBranchData:
     """
     Note:
@@ -52,8 +67,10 @@ class GatherCommitAndBranchData:
         - Now it reads the `.git/HEAD` file to get both the commit and branch data (to avoid the `dubious ownership` issues),
           so it no longer benefits from asyncronous calls, but keeping for reference.
         Called by:
-            - views.version()
+            - get_branch_and_commit_text()
         """
+        import trio
+
         log.debug('manage_git_calls')
         results_holder_dct = {}  # receives git responses as they're produced
         async with trio.open_nursery() as nursery:
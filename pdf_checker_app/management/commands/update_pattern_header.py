@@ -16,6 +16,7 @@ Notes:
 - The `PATTERN_HEADER_URL` source is considered **trusted**.
 """
 
+import os
 import pathlib
 import re
 from argparse import ArgumentParser
@@ -24,6 +25,12 @@ import httpx
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+## The bul_patterns.css stylesheet link, which belongs in <head> rather than the body include
+PATTERN_LINK_TAG_RE = re.compile(
+    r'(<link\s+[^>]*href=[\'\"]https://[^\'\"]+/common/css/bul_patterns\.css(?:\?[^\'\"]*)?[\'\"][^>]*>)',
+    re.IGNORECASE,
+)
+
 
 def fetch_pattern_header(url: str) -> str:
     """
@@ -58,16 +65,12 @@ def split_pattern_header(content: str) -> tuple[str, str]:
     """
     head_content = ''
     body_content = content
-    link_pattern = re.compile(
-        r'(<link\s+[^>]*href=[\'\"]https://[^\'\"]+/common/css/bul_patterns\.css(?:\?[^\'\"]*)?[\'\"][^>]*>)',
-        re.IGNORECASE,
-    )
-    match = link_pattern.search(content)
+    match = PATTERN_LINK_TAG_RE.search(content)
 
     if match:
-        link_tag = match.group(1)
-        head_content = f'{link_tag}\n'
-        body_content = content.replace(link_tag, '', 1)
+        ## Slice around the match rather than re-scanning the content with str.replace()
+        head_content = f'{match.group(1)}\n'
+        body_content = content[: match.start()] + content[match.end() :]
 
     return head_content, body_content
 
@@ -75,11 +78,18 @@ def split_pattern_header(content: str) -> tuple[str, str]:
 def save_pattern_header(content: str, target_path: pathlib.Path) -> None:
     """
     Saves pattern header HTML to the target file.
+    Writes a sibling temp file and renames it into place, so template loads never see a half-written include.
 
     Called by: handle()
     """
     target_path.parent.mkdir(parents=True, exist_ok=True)
-    target_path.write_text(content, encoding='utf-8')
+    temp_path: pathlib.Path = target_path.with_name(f'.{target_path.name}.tmp')
+    try:
+        temp_path.write_bytes(content.encode('utf-8'))
+        os.replace(temp_path, target_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
 
 
 class Command(BaseCommand):
@@ -2,18 +2,35 @@ import uuid
 
 from django.db import models
 
+from pdf_checker_app.lib.json_helpers import OrjsonJSONDecoder, OrjsonJSONEncoder
+
+
+class PDFDocumentQuerySet(models.QuerySet):
+    """
+    Adds opt-in relation loading for PDFDocument queries.
+    """
+
+    def with_results(self) -> 'PDFDocumentQuerySet':
+        """
+        Joins in the veraPDF result and OpenRouter summary, so `doc.verapdf_result` / `doc.openrouter_summary` need no
+        extra queries. Opt-in, since it also pulls the large JSON columns.
+        """
+        return self.select_related('verapdf_result', 'openrouter_summary')
+
 
 class PDFDocument(models.Model):
     """
     Stores uploaded PDF document metadata and Shibboleth user info.
     """
 
+    objects = PDFDocumentQuerySet.as_manager()
+
     ## Primary key
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     ## File identification
     original_filename = models.CharField(max_length=255)
-    file_checksum = models.CharField(max_length=64, unique=True, db_index=True)  # SHA-256
+    file_checksum = models.CharField(max_length=64, unique=True)  # SHA-256; the unique constraint's index serves lookups
     file_size = models.BigIntegerField()  # bytes
 
     ## Shibboleth user information
@@ -42,8 +59,8 @@ class PDFDocument(models.Model):
     class Meta:
         ordering = ['-uploaded_at']
         indexes = [
-            models.Index(fields=['file_checksum']),
             models.Index(fields=['-uploaded_at']),
+            models.Index(fields=['processing_status', 'uploaded_at'], name='pdfdoc_status_uploaded_idx'),  # cron scans
         ]
 
 
@@ -59,7 +76,8 @@ class VeraPDFResult(models.Model):
     pdf_document = models.OneToOneField(PDFDocument, on_delete=models.CASCADE, related_name='verapdf_result')
 
     ## veraPDF output
-    raw_json = models.JSONField()  # Complete veraPDF JSON output
+    raw_json = models.JSONField(encoder=OrjsonJSONEncoder, decoder=OrjsonJSONDecoder)  # Complete veraPDF JSON output
+    raw_json_pretty = models.TextField(blank=True, default='')  # indented raw_json for display; empty on older rows
 
     ## Parsed results
     is_accessible = models.BooleanField()  # Pass/fail status
@@ -91,7 +109,7 @@ class OpenRouterSummary(models.Model):
     )
 
     ## Persistence fields
-    raw_response_json = models.JSONField(null=True, blank=True)
+    raw_response_json = models.JSONField(null=True, blank=True, encoder=OrjsonJSONEncoder, decoder=OrjsonJSONDecoder)
     summary_text = models.TextField(blank=True)
     prompt = models.TextField(blank=True)
 
@@ -128,3 +146,6 @@ class OpenRouterSummary(models.Model):
     class Meta:
         verbose_name = 'OpenRouter Summary'
         verbose_name_plural = 'OpenRouter Summaries'
+        indexes = [
+            models.Index(fields=['status', 'requested_at'], name='openrouter_status_idx'),  # cron pending/failed scans
+        ]
@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock, patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase as TestCase
+
+from pdf_checker_app.forms import PDFUploadForm
+
+
+class PDFUploadFormTest(TestCase):
+    """
+    Checks PDFUploadForm file validation.
+    """
+
+    def make_form(self, content: bytes) -> PDFUploadForm:
+        """
+        Builds a bound upload form for the given file content.
+        """
+        upload = SimpleUploadedFile('test.pdf', content, content_type='application/pdf')
+        return PDFUploadForm(data={}, files={'pdf_file': upload})
+
+    def test_rejects_file_without_pdf_header(self) -> None:
+        """
+        Checks that a .pdf file lacking the %PDF- header is rejected.
+        """
+        with patch('pdf_checker_app.forms.get_magic', return_value=None):
+            form = self.make_form(b'not a pdf')
+            self.assertFalse(form.is_valid())
+        self.assertIn('File must be a valid PDF document.', form.errors['pdf_file'])
+
+    def test_magic_sees_same_header_bytes_and_file_is_rewound(self) -> None:
+        """
+        Checks that python-magic is handed the already-read header and the file pointer is reset afterwards.
+        """
+        content = b'%PDF-1.4 ' + (b'x' * 4096)
+        fake_magic = MagicMock()
+        fake_magic.from_buffer.return_value = 'application/pdf'
+        with patch('pdf_checker_app.forms.get_magic', return_value=fake_magic):
+            form = self.make_form(content)
+            self.assertTrue(form.is_valid())
+        fake_magic.from_buffer.assert_called_once_with(content[:2048], mime=True)
+        self.assertEqual(0, form.cleaned_data['pdf_file'].tell())
+
+    def test_rejects_file_magic_identifies_as_non_pdf(self) -> None:
+        """
+        Checks that a python-magic mismatch is reported rather than silently ignored.
+        """
+        fake_magic = MagicMock()
+        fake_magic.from_buffer.return_value = 'text/plain'
+        with patch('pdf_checker_app.forms.get_magic', return_value=fake_magic):
+            form = self.make_form(b'%PDF-1.4 plain text really')
+            self.assertFalse(form.is_valid())
+        self.assertIn('File must be a PDF document.', form.errors['pdf_file'])
@@ -0,0 +1,89 @@
+import dataclasses
+import datetime
+import json
+from decimal import Decimal
+
+from django.test import SimpleTestCase as TestCase
+
+from pdf_checker_app.lib.json_helpers import OrjsonJSONDecoder, OrjsonJSONEncoder
+
+
+@dataclasses.dataclass
+class EncodedPoint:
+    """
+    A dataclass value for encoder tests.
+    """
+
+    x: int
+
+
+class OrjsonJSONEncoderTest(TestCase):
+    """
+    Checks the orjson-backed JSONField encoder.
+    """
+
+    def test_encode_round_trips_json(self) -> None:
+        """
+        Checks that json.dumps(cls=OrjsonJSONEncoder) produces JSON that loads back to the same value.
+        """
+        value = {'report': {'jobs': [{'name': 'é', 'compliant': False, 'count': 3, 'ratio': 0.5, 'none': None}]}}
+        encoded = json.dumps(value, cls=OrjsonJSONEncoder)
+        self.assertEqual(value, json.loads(encoded))
+
+    def test_encode_falls_back_for_values_orjson_rejects(self) -> None:
+        """
+        Checks that values orjson can't serialize fall back to the stdlib encoder's behavior.
+        """
+        self.assertEqual('{"1": "a"}', json.dumps({1: 'a'}, cls=OrjsonJSONEncoder))
+        with self.assertRaises(TypeError):
+            json.dumps({'cost': Decimal('1.5')}, cls=OrjsonJSONEncoder)
+
+    def test_encode_leaves_datetimes_and_dataclasses_to_the_stdlib(self) -> None:
+        """
+        Checks that datetimes and dataclasses are rejected as the stdlib rejects them, not serialized by orjson.
+        """
+        for value in (datetime.datetime(2026, 1, 2, 3, 4, 5), EncodedPoint(x=1)):
+            with self.subTest(value=value):
+                with self.assertRaises(TypeError):
+                    json.dumps({'value': value}, cls=OrjsonJSONEncoder)
+
+    def test_encode_honors_caller_options(self) -> None:
+        """
+        Checks that non-default json.dumps() options produce exactly the stdlib's output.
+        """
+        value = {'b': 1, 'a': ['é', datetime.date(2026, 1, 2)]}
+        options_list: list[dict[str, object]] = [
+            {'indent': 2, 'default': str},
+            {'sort_keys': True, 'default': str},
+            {'ensure_ascii': False, 'default': str},
+            {'separators': (',', ':'), 'default': str},
+        ]
+        for options in options_list:
+            with self.subTest(options=options):
+                self.assertEqual(json.dumps(value, **options), json.dumps(value, cls=OrjsonJSONEncoder, **options))
+
+    def test_encode_writes_nan_as_null(self) -> None:
+        """
+        Checks the documented difference from the stdlib: NaN and infinities encode as (valid-JSON) null, not NaN.
+        """
+        self.assertEqual('[null,null]', json.dumps([float('nan'), float('inf')], cls=OrjsonJSONEncoder))
+
+
+class OrjsonJSONDecoderTest(TestCase):
+    """
+    Checks the orjson-backed JSONField decoder.
+    """
+
+    def test_decode_parses_json(self) -> None:
+        """
+        Checks that json.loads(cls=OrjsonJSONDecoder) parses nested JSON.
+        """
+        self.assertEqual({'a': [1, 2.5, None, 'é']}, json.loads('{"a": [1, 2.5, null, "é"]}', cls=OrjsonJSONDecoder))
+
+    def test_decode_matches_stdlib_on_edge_cases(self) -> None:
+        """
+        Checks that stdlib-only input still parses and invalid JSON still raises json.JSONDecodeError.
+        """
+        self.assertEqual({'big': 2**70}, json.loads('{"big": %s}' % (2**70), cls=OrjsonJSONDecoder))
+        with self.assertRaises(json.JSONDecodeError):
+            json.loads('{not json', cls=OrjsonJSONDecoder)
@@ -1,3 +1,8 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
 from django.test import SimpleTestCase as TestCase
 
 from pdf_checker_app.lib import markdown_helpers
@@ -23,3 +28,35 @@ class MarkdownHelpersTest(TestCase):
         html = markdown_helpers.load_markdown_from_lib('info.md')
         self.assertIn('About the experimental PDF Accessibility Checker', html)
         self.assertIn('This is an <em>experimental</em> webapp.', html)
+
+    def test_render_markdown_text_reuses_converter_without_leaking_state(self) -> None:
+        """
+        Checks repeated render_markdown_text() calls reuse one converter and don't carry footnotes/abbreviations over.
+        """
+        first_html = markdown_helpers.render_markdown_text('Text[^1]\n\n[^1]: A footnote.')
+        converter = markdown_helpers.get_markdown_converter()
+        second_html = markdown_helpers.render_markdown_text('Plain text.')
+        self.assertIn('A footnote.', first_html)
+        self.assertIs(converter, markdown_helpers.get_markdown_converter())
+        self.assertNotIn('footnote', second_html)
+
+    def test_load_markdown_file_rerenders_when_file_changes(self) -> None:
+        """
+        Checks load_markdown_file() serves cached HTML until the file's mtime changes.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / 'page.md'
+            file_path.write_text('# First', encoding='utf-8')
+            os.utime(file_path, ns=(1_000_000_000, 1_000_000_000))
+            self.assertIn('First', markdown_helpers.load_markdown_file(file_path))
+            self.assertIn('First', markdown_helpers.load_markdown_file(file_path))
+            file_path.write_text('# Second', encoding='utf-8')
+            os.utime(file_path, ns=(2_000_000_000, 2_000_000_000))
+            self.assertIn('Second', markdown_helpers.load_markdown_file(file_path))
+
+    def test_build_info_json_serializes_the_info_context(self) -> None:
+        """
+        Checks build_info_json() dumps the same payload build_info_context() gives the info template.
+        """
+        info_json: bytes = markdown_helpers.build_info_json('<p>About</p>')
+        self.assertEqual(markdown_helpers.build_info_context('<p>About</p>'), json.loads(info_json))
@@ -0,0 +1,369 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+from django.test import SimpleTestCase as TestCase
+from django.test.utils import override_settings
+from django.utils import timezone as django_timezone
+
+from pdf_checker_app.lib import openrouter_helpers
+
+log = logging.getLogger(__name__)
+TestCase.maxDiff = 1000
+
+
+def make_status_error(status_code: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    """
+    Builds an HTTPStatusError carrying the given status code (and optional response headers).
+    """
+    request = httpx.Request('POST', openrouter_helpers.OPENROUTER_API_URL)
+    response = httpx.Response(status_code, request=request, headers=headers)
+    return httpx.HTTPStatusError(f'status {status_code}', request=request, response=response)
+
+
+class FilterDownFailureChecksTest(TestCase):
+    """
+    Checks veraPDF JSON pruning before prompt-building.
+    """
+
+    def test_filter_down_failure_checks_keeps_first_check_per_rule(self) -> None:
+        """
+        Checks that every nested 'checks' array is truncated to its first element, in place.
+        """
+        raw_json: dict = {
+            'report': {
+                'jobs': [
+                    {
+                        'validationResult': [
+                            {
+                                'details': {
+                                    'ruleSummaries': [
+                                        {'clause': '7.1', 'checks': [{'id': 1}, {'id': 2}, {'id': 3}]},
+                                        {'clause': '7.2', 'checks': [{'id': 4}]},
+                                        {'clause': '7.3', 'checks': []},
+                                    ]
+                                }
+                            }
+                        ]
+                    }
+                ]
+            }
+        }
+        result = openrouter_helpers.filter_down_failure_checks(raw_json)
+        self.assertIs(raw_json, result)
+        rule_summaries = result['report']['jobs'][0]['validationResult'][0]['details']['ruleSummaries']
+        self.assertEqual([{'id': 1}], rule_summaries[0]['checks'])
+        self.assertEqual([{'id': 4}], rule_summaries[1]['checks'])
+        self.assertEqual([], rule_summaries[2]['checks'])
+        self.assertEqual('7.3', rule_summaries[2]['clause'])
+
+    def test_filter_down_failure_checks_skips_size_logging_without_debug(self) -> None:
+        """
+        Checks that the before/after size serializations only run when DEBUG logging is enabled.
+        """
+        raw_json: dict = {'ruleSummaries': [{'checks': [{'id': 1}, {'id': 2}]}]}
+        with patch.object(openrouter_helpers.log, 'isEnabledFor', return_value=False):
+            with patch.object(openrouter_helpers.orjson, 'dumps') as mock_dumps:
+                openrouter_helpers.filter_down_failure_checks(raw_json)
+        mock_dumps.assert_not_called()
+        self.assertEqual([{'id': 1}], raw_json['ruleSummaries'][0]['checks'])
+
+
+class SettingsAccessorsTest(TestCase):
+    """
+    Checks the cached settings accessors.
+    """
+
+    def test_cached_accessors_follow_override_settings(self) -> None:
+        """
+        Checks that get_api_key() and get_model_order() pick up overridden settings and revert afterwards.
+        """
+        original_model_order = openrouter_helpers.get_model_order()
+        with override_settings(OPENROUTER_API_KEY='override-key', OPENROUTER_MODEL_ORDER=['model/a', 'model/b']):
+            self.assertEqual('override-key', openrouter_helpers.get_api_key())
+            self.assertEqual(('model/a', 'model/b'), openrouter_helpers.get_model_order())
+        self.assertEqual(original_model_order, openrouter_helpers.get_model_order())
+
+
+class BuildPromptTest(TestCase):
+    """
+    Checks prompt-building from pruned veraPDF JSON.
+    """
+
+    def test_build_prompt_embeds_compact_json(self) -> None:
+        """
+        Checks that build_prompt() embeds the veraPDF JSON compactly and in original key order.
+        """
+        prompt = openrouter_helpers.build_prompt({'report': {'b': 1, 'a': 'é'}})
+        self.assertIn('{"report":{"b":1,"a":"é"}}', prompt)
+        self.assertNotIn('{verapdf_json_output}', prompt)
+
+    def test_build_prompt_picks_up_template_edits(self) -> None:
+        """
+        Checks that the cached prompt template is re-read once the file's mtime changes.
+        """
+        self.addCleanup(openrouter_helpers.read_prompt_template_cached.cache_clear)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir) / 'prompt.md'
+            with patch.object(openrouter_helpers, 'PROMPT_FILE_PATH', template_path):
+                template_path.write_text('first {verapdf_json_output}', encoding='utf-8')
+                os.utime(template_path, ns=(1_000_000_000, 1_000_000_000))
+                self.assertEqual('first {}', openrouter_helpers.build_prompt({}))
+                template_path.write_text('second {verapdf_json_output}', encoding='utf-8')
+                os.utime(template_path, ns=(2_000_000_000, 2_000_000_000))
+                self.assertEqual('second {}', openrouter_helpers.build_prompt({}))
+
+    def test_build_prompt_keeps_other_braces_literal(self) -> None:
+        """
+        Checks that braces elsewhere in the template, and in the veraPDF data, pass through untouched.
+        """
+        self.addCleanup(openrouter_helpers.read_prompt_template_cached.cache_clear)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_path = Path(temp_dir) / 'prompt.md'
+            template_path.write_text('Example: {"rule": "7.1"} {{x}}\n{verapdf_json_output}\n', encoding='utf-8')
+            with patch.object(openrouter_helpers, 'PROMPT_FILE_PATH', template_path):
+                prompt = openrouter_helpers.build_prompt({'message': '{verapdf_json_output} {0}'})
+        self.assertEqual(
+            'Example: {"rule": "7.1"} {{x}}\n{"message":"{verapdf_json_output} {0}"}\n',
+            prompt,
+        )
+
+
+class CallOpenRouterTest(TestCase):
+    """
+    Checks the OpenRouter HTTP call and shared client.
+    """
+
+    def test_get_http_client_reuses_client(self) -> None:
+        """
+        Checks that get_http_client() returns the same client across calls.
+        """
+        self.addCleanup(openrouter_helpers.close_http_clients)
+        first = openrouter_helpers.get_http_client()
+        second = openrouter_helpers.get_http_client()
+        self.assertIs(first, second)
+        self.assertEqual('PDF Accessibility Checker', first.headers['X-Title'])
+        openrouter_helpers.close_http_clients()
+        self.assertTrue(first.is_closed)
+        self.assertIsNot(first, openrouter_helpers.get_http_client())
+
+    def get_http_client_after_barrier(self, barrier: threading.Barrier) -> httpx.Client:
+        """
+        Waits until every worker is ready, then calls get_http_client(), so the first calls race.
+        """
+        barrier.wait()
+        return openrouter_helpers.get_http_client()
+
+    def test_get_http_client_builds_one_client_for_concurrent_first_calls(self) -> None:
+        """
+        Checks that threads making their first get_http_client() call at the same time all get the one shared client.
+        """
+        openrouter_helpers.close_http_clients()
+        self.addCleanup(openrouter_helpers.close_http_clients)
+        barrier = threading.Barrier(4, timeout=5)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            clients = list(executor.map(self.get_http_client_after_barrier, [barrier] * 4))
+        self.assertEqual(1, len({id(client) for client in clients}))
+        self.assertEqual([clients[0]], list(openrouter_helpers._HTTP_CLIENTS.values()))
+
+    def record_request(self, request: httpx.Request) -> httpx.Response:
+        """
+        Records the outgoing request and returns a canned OpenRouter response.
+        """
+        self.seen_requests.append(request)
+        return httpx.Response(200, json={'id': 'gen-123'})
+
+    def test_call_openrouter_posts_with_per_request_timeout(self) -> None:
+        """
+        Checks that call_openrouter() posts through the shared client and returns the JSON body.
+        """
+        self.seen_requests: list[httpx.Request] = []
+        client = httpx.Client(
+            headers=openrouter_helpers.OPENROUTER_CLIENT_HEADERS, transport=httpx.MockTransport(self.record_request)
+        )
+        self.addCleanup(client.close)
+        with patch.object(openrouter_helpers, 'get_http_client', return_value=client):
+            result = openrouter_helpers.call_openrouter('prompt', 'test-key', 'test/model', 12.5)
+        self.assertEqual({'id': 'gen-123'}, result)
+        self.assertEqual(1, len(self.seen_requests))
+        self.assertEqual('Bearer test-key', self.seen_requests[0].headers['Authorization'])
+        self.assertEqual(12.5, self.seen_requests[0].extensions['timeout']['read'])
+        self.assertEqual('application/json', self.seen_requests[0].headers['Content-Type'])
+        self.assertEqual(
+            {'model': 'test/model', 'messages': [{'role': 'user', 'content': 'prompt'}]},
+            json.loads(self.seen_requests[0].content),
+        )
+
+
+class ParseOpenRouterResponseTest(TestCase):
+    """
+    Checks extraction of summary fields from OpenRouter responses.
+    """
+
+    def test_parse_openrouter_response_extracts_fields(self) -> None:
+        """
+        Checks that text, identity, usage, and a naive local `created` datetime are extracted.
+        """
+        response_json = {
+            'id': 'gen-123',
+            'provider': 'SomeProvider',
+            'model': 'test/model',
+            'created': 1760000000,
+            'choices': [{'message': {'content': 'Do this first.'}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15},
+        }
+        parsed = openrouter_helpers.parse_openrouter_response(response_json)
+        expected_created = django_timezone.make_naive(datetime.fromtimestamp(1760000000, tz=timezone.utc))
+        self.assertEqual('Do this first.', parsed['summary_text'])
+        self.assertEqual('stop', parsed['finish_reason'])
+        self.assertEqual('gen-123', parsed['openrouter_response_id'])
+        self.assertEqual(15, parsed['total_tokens'])
+        self.assertEqual(expected_created, parsed['openrouter_created_at'])
+
+    def test_parse_openrouter_response_handles_sparse_response(self) -> None:
+        """
+        Checks that a response without choices, usage, or created falls back to empty defaults.
+        """
+        parsed = openrouter_helpers.parse_openrouter_response({'choices': []})
+        self.assertEqual('', parsed['summary_text'])
+        self.assertEqual('', parsed['finish_reason'])
+        self.assertIsNone(parsed['openrouter_created_at'])
+        self.assertIsNone(parsed['prompt_tokens'])
+
+    def test_parse_openrouter_response_handles_null_sections(self) -> None:
+        """
+        Checks that explicit nulls for message and usage fall back to empty defaults rather than raising.
+        """
+        parsed = openrouter_helpers.parse_openrouter_response(
+            {'id': 'gen-1', 'choices': [{'message': None, 'finish_reason': 'error'}], 'usage': None}
+        )
+        self.assertEqual('', parsed['summary_text'])
+        self.assertEqual('error', parsed['finish_reason'])
+        self.assertIsNone(parsed['total_tokens'])
+
+
+class CallOpenRouterWithModelOrderTest(TestCase):
+    """
+    Checks model fallback in call_openrouter_with_model_order().
+    """
+
+    def test_falls_back_to_next_model_on_server_error(self) -> None:
+        """
+        Checks that a 5xx from the first model moves on to the next model.
+        """
+        side_effect = [make_status_error(503), {'id': 'gen-ok'}]
+        with patch.object(openrouter_helpers, 'call_openrouter', side_effect=side_effect) as mock_call:
+            result = openrouter_helpers.call_openrouter_with_model_order('prompt', 'key', ('model/a', 'model/b'), 5)
+        self.assertEqual({'id': 'gen-ok'}, result)
+        self.assertEqual(2, mock_call.call_count)
+
+    def test_stops_on_auth_error(self) -> None:
+        """
+        Checks that a 401 is raised immediately without trying the remaining models.
+        """
+        with patch.object(openrouter_helpers, 'call_openrouter', side_effect=make_status_error(401)) as mock_call:
+            with self.assertRaises(httpx.HTTPStatusError):
+                openrouter_helpers.call_openrouter_with_model_order('prompt', 'key', ('model/a', 'model/b'), 5)
+        self.assertEqual(1, mock_call.call_count)
+
+
+class CallOpenRouterWithRetriesTest(TestCase):
+    """
+    Checks transient-failure retries in call_openrouter_with_retries().
+    """
+
+    def test_retries_transient_status_after_wait(self) -> None:
+        """
+        Checks that a 429 is retried after a backoff wait and the later success is returned.
+        """
+        side_effect = [make_status_error(429), {'id': 'gen-ok'}]
+        with patch.object(openrouter_helpers, 'call_openrouter_with_model_order', side_effect=side_effect) as mock_call:
+            with patch.object(openrouter_helpers.time, 'sleep') as mock_sleep:
+                result = openrouter_helpers.call_openrouter_with_retries('prompt', 'key', ('model/a',), 5, 60)
+        self.assertEqual({'id': 'gen-ok'}, result)
+        self.assertEqual(2, mock_call.call_count)
+        mock_sleep.assert_called_once()
+        self.assertTrue(2.0 <= mock_sleep.call_args.args[0] <= 4.0)
+
+    def test_honors_longer_retry_after(self) -> None:
+        """
+        Checks that a server-sent Retry-After longer than the backoff wait is used, capped at the max retry wait.
+        """
+        for retry_after, expected_wait in (('10', 10.0), ('600', openrouter_helpers.OPENROUTER_MAX_RETRY_WAIT_SECONDS)):
+            with self.subTest(retry_after=retry_after):
+                side_effect = [make_status_error(429, headers={'Retry-After': retry_after}), {'id': 'gen-ok'}]
+                with patch.object(openrouter_helpers, 'call_openrouter_with_model_order', side_effect=side_effect):
+                    with patch.object(openrouter_helpers.time, 'sleep') as mock_sleep:
+                        openrouter_helpers.call_openrouter_with_retries('prompt', 'key', ('model/a',), 5, 600)
+                mock_sleep.assert_called_once_with(expected_wait)
+
+    def test_retries_connection_error(self) -> None:
+        """
+        Checks that a failure to connect is retried like a transient status.
+        """
+        side_effect = [httpx.ConnectError('connection refused'), {'id': 'gen-ok'}]
+        with patch.object(openrouter_helpers, 'call_openrouter_with_model_order', side_effect=side_effect) as mock_call:
+            with patch.object(openrouter_helpers.time, 'sleep'):
+                result = openrouter_helpers.call_openrouter_with_retries('prompt', 'key', ('model/a',), 5, 60)
+        self.assertEqual({'id': 'gen-ok'}, result)
+        self.assertEqual(2, mock_call.call_count)
+
+    def test_does_not_wait_past_deadline(self) -> None:
+        """
+        Checks that a transient failure is re-raised without sleeping when the wait would overrun the deadline.
+        """
+        with patch.object(openrouter_helpers, 'call_openrouter_with_model_order', side_effect=make_status_error(503)):
+            with patch.object(openrouter_helpers.time, 'sleep') as mock_sleep:
+                with self.assertRaises(httpx.HTTPStatusError):
+                    openrouter_helpers.call_openrouter_with_retries('prompt', 'key', ('model/a',), 5, 1)
+        mock_sleep.assert_not_called()
+
+    def advance_clock(self, seconds: float) -> None:
+        """
+        Moves the patched time.monotonic() forward; stands in for time.sleep().
+        """
+        self.mock_monotonic.return_value += seconds
+
+    def fail_slowly(self, *_args: object) -> dict:
+        """
+        Stands in for a model-order pass whose attempts took 25 seconds in total, then failed with a 503.
+        """
+        self.advance_clock(25.0)
+        raise make_status_error(503)
+
+    def test_retry_fits_in_what_is_left_of_the_deadline(self) -> None:
+        """
+        Checks that after a slow failed attempt, the retry's per-model timeout is cut to fit the deadline,
+        and that no further retry is made once too little time remains.
+        """
+        self.mock_monotonic = MagicMock(return_value=0.0)
+        with patch.object(openrouter_helpers.time, 'monotonic', self.mock_monotonic):
+            with patch.object(openrouter_helpers.time, 'sleep', side_effect=self.advance_clock):
+                with patch.object(
+                    openrouter_helpers, 'call_openrouter_with_model_order', side_effect=self.fail_slowly
+                ) as mock_call:
+                    with self.assertRaises(httpx.HTTPStatusError):
+                        openrouter_helpers.call_openrouter_with_retries('prompt', 'key', ('model/a', 'model/b'), 30, 60)
+        self.assertEqual(2, mock_call.call_count)
+        self.assertEqual(30, mock_call.call_args_list[0].args[3])
+        ## (60s - 25s spent - 2..4s wait) shared by two models
+        self.assertTrue(15.5 <= mock_call.call_args_list[1].args[3] <= 16.5)
+        self.assertLessEqual(self.mock_monotonic.return_value, 60.0)
+
+    def test_does_not_retry_client_error(self) -> None:
+        """
+        Checks that a non-transient status such as 400 is raised on the first attempt.
+        """
+        with patch.object(
+            openrouter_helpers, 'call_openrouter_with_model_order', side_effect=make_status_error(400)
+        ) as mock_call:
+            with self.assertRaises(httpx.HTTPStatusError):
+                openrouter_helpers.call_openrouter_with_retries('prompt', 'key', ('model/a',), 5, 60)
+        self.assertEqual(1, mock_call.call_count)
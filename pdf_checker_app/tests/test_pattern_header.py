@@ -1,3 +1,6 @@
+import pathlib
+import tempfile
+
 from bs4 import BeautifulSoup
 from django.test import SimpleTestCase as TestCase
 
@@ -82,3 +85,20 @@ class PatternHeaderSplitTest(TestCase):
         )
         self.assertEqual(parsed_link.get('rel'), ['stylesheet'])
         self.assertNotIn('bul_patterns.css', body_content)
+
+
+class PatternHeaderSaveTest(TestCase):
+    """
+    Checks save_pattern_header file writing.
+    """
+
+    def test_save_pattern_header_replaces_file_without_leftovers(self) -> None:
+        """
+        Checks that save_pattern_header() overwrites the target in place and leaves no temp file behind.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_path = pathlib.Path(temp_dir) / 'includes' / 'body.html'
+            update_pattern_header.save_pattern_header('old', target_path)
+            update_pattern_header.save_pattern_header('<div>new é</div>', target_path)
+            self.assertEqual('<div>new é</div>', target_path.read_text(encoding='utf-8'))
+            self.assertEqual(['body.html'], [path.name for path in target_path.parent.iterdir()])
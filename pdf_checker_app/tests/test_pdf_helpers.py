@@ -1,8 +1,9 @@
+import hashlib
 import logging
 import tempfile
 from pathlib import Path
 
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
 from django.test import SimpleTestCase as TestCase
 from django.test.utils import override_settings
 
@@ -58,3 +59,78 @@ class PDFHelperParseVeraPDFOutputTest(TestCase):
         item_details = first_job.get('itemDetails')
         self.assertIsInstance(item_details, dict)
         self.assertEqual(item_details.get('name'), '/path/to/pdf_uploads/test.pdf')
+
+    def test_parse_verapdf_output_accepts_bytes(self) -> None:
+        """
+        Checks that parse_verapdf_output() parses undecoded bytes, as returned by run_verapdf().
+        """
+        parsed = pdf_helpers.parse_verapdf_output(b'{"jobs": [{"itemDetails": {"name": "/tmp/x/abc.pdf"}}]}')
+        self.assertEqual('/path/to/pdf_uploads/abc.pdf', parsed['jobs'][0]['itemDetails']['name'])
+
+
+class PDFHelperRunVeraPDFTest(TestCase):
+    """
+    Checks run_verapdf() subprocess handling.
+    """
+
+    def test_run_verapdf_returns_stdout_bytes(self) -> None:
+        """
+        Checks that run_verapdf() returns the CLI's stdout as bytes, without decoding.
+        """
+        output = pdf_helpers.run_verapdf(Path('some.pdf'), Path('/bin/echo'), timeout_seconds=10)
+        self.assertEqual(b'-f ua1 --maxfailuresdisplayed 999999 --format json some.pdf\n', output)
+
+
+class PDFHelperGenerateChecksumTest(TestCase):
+    """
+    Checks upload checksumming.
+    """
+
+    def test_generate_checksum_matches_sha256_for_memory_and_disk_uploads(self) -> None:
+        """
+        Checks that generate_checksum() returns the SHA-256 hex digest for in-memory and temp-file uploads, and rewinds.
+        """
+        content: bytes = b'%PDF-1.4 ' + (b'checksum content ' * 10_000)
+        expected = hashlib.sha256(content).hexdigest()
+
+        in_memory_upload = SimpleUploadedFile('test.pdf', content, content_type='application/pdf')
+        self.assertEqual(expected, pdf_helpers.generate_checksum(in_memory_upload))
+        self.assertEqual(0, in_memory_upload.tell())
+
+        temp_file_upload = TemporaryUploadedFile('test.pdf', 'application/pdf', len(content), None)
+        self.addCleanup(temp_file_upload.close)
+        temp_file_upload.write(content)
+        self.assertEqual(expected, pdf_helpers.generate_checksum(temp_file_upload))
+        self.assertEqual(0, temp_file_upload.tell())
+
+
+class PDFHelperGetVeraPDFCompliantTest(TestCase):
+    """
+    Checks compliance extraction from veraPDF JSON.
+    """
+
+    def test_get_verapdf_compliant_reads_wrapped_and_bare_reports(self) -> None:
+        """
+        Checks that the compliant flag is read with or without the top-level 'report' wrapper.
+        """
+        jobs = [{'validationResult': [{'compliant': False}]}]
+        self.assertIs(False, pdf_helpers.get_verapdf_compliant({'report': {'jobs': jobs}}))
+        self.assertIs(False, pdf_helpers.get_verapdf_compliant({'jobs': jobs}))
+        self.assertIs(True, pdf_helpers.get_verapdf_compliant({'jobs': [{'validationResult': [{'compliant': True}]}]}))
+
+    def test_get_verapdf_compliant_returns_none_for_malformed_shapes(self) -> None:
+        """
+        Checks that missing, empty, or wrongly-typed levels yield None rather than raising.
+        """
+        malformed_inputs: list[dict] = [
+            {},
+            {'report': 'not-a-dict'},
+            {'jobs': []},
+            {'jobs': 'abc'},
+            {'jobs': [None]},
+            {'jobs': [{'validationResult': []}]},
+            {'jobs': [{'validationResult': [{'compliant': 'yes'}]}]},
+        ]
+        for raw_json in malformed_inputs:
+            with self.subTest(raw_json=raw_json):
+                self.assertIsNone(pdf_helpers.get_verapdf_compliant(raw_json))
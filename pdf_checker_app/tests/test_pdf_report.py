@@ -4,7 +4,7 @@ import uuid
 from django.test import TestCase
 from django.urls import reverse
 
-from pdf_checker_app.models import PDFDocument
+from pdf_checker_app.models import OpenRouterSummary, PDFDocument, VeraPDFResult
 
 log = logging.getLogger(__name__)
 TestCase.maxDiff = 1000
@@ -42,6 +42,25 @@ class PDFReportTest(TestCase):
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'test.pdf')
 
+    def test_pdf_report_loads_results_in_one_query(self):
+        """
+        Checks that the report fetches the document, its veraPDF result, and its summary in a single joined query.
+        """
+        VeraPDFResult.objects.create(
+            pdf_document=self.document,
+            raw_json={'report': {'jobs': [{'validationResult': [{'compliant': False}]}]}},
+            is_accessible=False,
+            validation_profile='PDF/UA-1',
+            verapdf_version='1.0',
+        )
+        OpenRouterSummary.objects.create(pdf_document=self.document, status='completed', summary_text='Fix the tags.')
+        url = reverse('pdf_report_url', kwargs={'pk': self.test_uuid})
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        self.assertContains(response, 'Fix the tags.')
+        self.assertContains(response, 'compliant')
+
     def test_pdf_report_url_with_invalid_uuid(self):
         """
         Checks that PDF report URL returns 404 for invalid UUID.
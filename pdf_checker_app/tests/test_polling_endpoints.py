@@ -14,66 +14,77 @@ log = logging.getLogger(__name__)
 TestCase.maxDiff = 1000
 
 
+def set_processing_status(document: PDFDocument, status: str) -> None:
+    """
+    Sets a test document's processing_status with a single-column UPDATE.
+    """
+    PDFDocument.objects.filter(pk=document.pk).update(processing_status=status)
+
+
 class StatusFragmentTest(TestCase):
     """
     Checks status fragment endpoint behavior.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Sets up test data.
         """
-        self.test_uuid = uuid.uuid4()
-        self.document = PDFDocument.objects.create(
-            id=self.test_uuid,
+        cls.test_uuid = uuid.uuid4()
+        cls.status_url = reverse('status_fragment_url', kwargs={'pk': cls.test_uuid})
+        cls.document = PDFDocument.objects.create(
+            id=cls.test_uuid,
             original_filename='test.pdf',
             file_checksum='test_checksum_status',
             file_size=1024,
             processing_status='pending',
         )
 
-    def test_status_fragment_pending(self):
-        """
-        Checks that status fragment returns polling attributes for pending status.
-        """
-        url = reverse('status_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
-        self.assertEqual(200, response.status_code)
-        self.assertContains(response, 'hx-get')
-        self.assertContains(response, 'hx-trigger')
-        self.assertContains(response, 'queued for processing')
-
-    def test_status_fragment_processing(self):
-        """
-        Checks that status fragment returns polling attributes for processing status.
-        """
-        self.document.processing_status = 'processing'
-        self.document.save()
-        url = reverse('status_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+    def test_status_fragment_states(self):
+        """
+        Checks each processing status's message, whether it keeps polling, and its Cache-Control header.
+        """
+        cases: list[tuple[str, tuple[str, ...], bool, str]] = [
+            ('pending', ('queued for processing',), True, 'no-cache'),
+            ('processing', ('currently being processed',), True, 'no-cache'),
+            ('completed', ('Processing complete', 'verapdf.fragment'), False, 'private, max-age=600'),
+            ('failed', ('Processing failed',), False, 'no-cache'),  # failed documents can be re-uploaded
+        ]
+        for status, needles, should_poll, cache_control in cases:
+            with self.subTest(status=status):
+                set_processing_status(self.document, status)
+                response = self.client.get(self.status_url)
+                self.assertEqual(200, response.status_code)
+                for needle in needles:
+                    self.assertContains(response, needle)
+                if should_poll:
+                    self.assertContains(response, 'hx-trigger="every')
+                else:
+                    self.assertNotContains(response, 'hx-trigger="every')
+                self.assertEqual(cache_control, response['Cache-Control'])
+
+    def test_status_fragment_unchanged_status_returns_not_modified(self):
+        """
+        Checks that a poll with the current status's ETag gets an empty 304, and a stale ETag gets a fresh render.
+        """
+        etag = self.client.get(self.status_url)['ETag']
+        with self.assertNumQueries(1):  # just the document; nothing rendered
+            response = self.client.get(self.status_url, headers={'If-None-Match': etag})
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b'', response.content)
+        self.assertEqual(etag, response['ETag'])
+        set_processing_status(self.document, 'processing')
+        response = self.client.get(self.status_url, headers={'If-None-Match': etag})
         self.assertEqual(200, response.status_code)
-        self.assertContains(response, 'hx-get')
         self.assertContains(response, 'currently being processed')
-
-    def test_status_fragment_completed(self):
-        """
-        Checks that status fragment stops polling for completed status.
-        """
-        self.document.processing_status = 'completed'
-        self.document.save()
-        url = reverse('status_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
-        self.assertEqual(200, response.status_code)
-        self.assertContains(response, 'Processing complete')
-        ## Should trigger verapdf fragment load
-        self.assertContains(response, 'verapdf.fragment')
+        self.assertNotEqual(etag, response['ETag'])
 
     def test_status_fragment_completed_accessible(self):
         """
         Checks that status fragment renders accessible assessment when compliant is True.
         """
-        self.document.processing_status = 'completed'
-        self.document.save()
+        set_processing_status(self.document, 'completed')
         VeraPDFResult.objects.create(
             pdf_document=self.document,
             raw_json={
@@ -93,8 +104,7 @@ class StatusFragmentTest(TestCase):
             validation_profile='PDF/UA-1',
             verapdf_version='1.0',
         )
-        url = reverse('status_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        response = self.client.get(self.status_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'Assessment:')
         self.assertContains(response, 'assessment-accessible')
@@ -104,8 +114,7 @@ class StatusFragmentTest(TestCase):
         """
         Checks that status fragment renders not-accessible assessment when compliant is False.
         """
-        self.document.processing_status = 'completed'
-        self.document.save()
+        set_processing_status(self.document, 'completed')
         VeraPDFResult.objects.create(
             pdf_document=self.document,
             raw_json={
@@ -125,26 +134,12 @@ class StatusFragmentTest(TestCase):
             validation_profile='PDF/UA-1',
             verapdf_version='1.0',
         )
-        url = reverse('status_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        response = self.client.get(self.status_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'Assessment:')
         self.assertContains(response, 'assessment-not-accessible')
         self.assertContains(response, 'not-accessible')
 
-    def test_status_fragment_failed(self):
-        """
-        Checks that status fragment stops polling for failed status.
-        """
-        self.document.processing_status = 'failed'
-        self.document.save()
-        url = reverse('status_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
-        self.assertEqual(200, response.status_code)
-        self.assertContains(response, 'Processing failed')
-        ## Should not have polling attributes
-        self.assertNotContains(response, 'hx-trigger="every')
-
     def test_status_fragment_invalid_uuid(self):
         """
         Checks that status fragment returns 404 for invalid UUID.
@@ -154,13 +149,17 @@ class StatusFragmentTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(404, response.status_code)
 
-    def test_status_fragment_cache_control(self):
+    def test_status_fragment_poll_does_not_touch_session(self):
         """
-        Checks that status fragment sets Cache-Control header.
+        Checks that a poll (even with a session cookie) runs only the document query; session/auth/messages stay lazy.
+        The document query selects only the columns the fragment reads.
         """
-        url = reverse('status_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
-        self.assertEqual('no-store', response['Cache-Control'])
+        self.client.cookies['sessionid'] = 'not-a-real-session-key'
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get(self.status_url)
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertNotIn('"processing_error"', queries.captured_queries[0]['sql'])
 
 
 class VerapdfFragmentTest(TestCase):
@@ -168,13 +167,15 @@ class VerapdfFragmentTest(TestCase):
     Checks veraPDF fragment endpoint behavior.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Sets up test data.
         """
-        self.test_uuid = uuid.uuid4()
-        self.document = PDFDocument.objects.create(
-            id=self.test_uuid,
+        cls.test_uuid = uuid.uuid4()
+        cls.verapdf_url = reverse('verapdf_fragment_url', kwargs={'pk': cls.test_uuid})
+        cls.document = PDFDocument.objects.create(
+            id=cls.test_uuid,
             original_filename='test.pdf',
             file_checksum='test_checksum_verapdf',
             file_size=1024,
@@ -185,61 +186,69 @@ class VerapdfFragmentTest(TestCase):
         """
         Checks that verapdf fragment handles missing result gracefully.
         """
-        url = reverse('verapdf_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        response = self.client.get(self.verapdf_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'No veraPDF results available')
+        self.assertEqual('no-store', response['Cache-Control'])
 
     def test_verapdf_fragment_with_result(self):
         """
-        Checks that verapdf fragment returns JSON when result exists.
+        Checks that verapdf fragment returns the stored pretty-printed JSON when result exists.
         """
         VeraPDFResult.objects.create(
             pdf_document=self.document,
             raw_json={'test': 'data'},
+            raw_json_pretty='{\n  "test": "stored"\n}',
             is_accessible=True,
             validation_profile='PDF/UA-1',
             verapdf_version='1.0',
         )
-        url = reverse('verapdf_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        with self.assertNumQueries(2):  # the document, then only the result's raw_json_pretty
+            response = self.client.get(self.verapdf_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'veraPDF Response')
-        self.assertContains(response, 'test')
+        self.assertContains(response, 'stored')
+
+    def test_verapdf_fragment_formats_result_without_stored_pretty_json(self):
+        """
+        Checks that a result saved before raw_json_pretty existed still renders, formatted from raw_json.
+        """
+        VeraPDFResult.objects.create(
+            pdf_document=self.document,
+            raw_json={'test': 'data'},
+            is_accessible=True,
+            validation_profile='PDF/UA-1',
+            verapdf_version='1.0',
+        )
+        response = self.client.get(self.verapdf_url)
+        self.assertEqual(200, response.status_code)
+        self.assertContains(response, 'data')
 
     def test_verapdf_fragment_pending_status(self):
         """
         Checks that verapdf fragment returns empty container for pending status.
         """
-        self.document.processing_status = 'pending'
-        self.document.save()
-        url = reverse('verapdf_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        set_processing_status(self.document, 'pending')
+        response = self.client.get(self.verapdf_url)
         self.assertEqual(200, response.status_code)
         ## Should not contain JSON content
         self.assertNotContains(response, 'Raw veraPDF JSON')
 
-    def test_verapdf_fragment_cache_control(self):
-        """
-        Checks that verapdf fragment sets Cache-Control header.
-        """
-        url = reverse('verapdf_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
-        self.assertEqual('no-store', response['Cache-Control'])
-
 
 class SummaryFragmentTest(TestCase):
     """
     Checks summary fragment endpoint behavior.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Sets up test data.
         """
-        self.test_uuid = uuid.uuid4()
-        self.document = PDFDocument.objects.create(
-            id=self.test_uuid,
+        cls.test_uuid = uuid.uuid4()
+        cls.summary_url = reverse('summary_fragment_url', kwargs={'pk': cls.test_uuid})
+        cls.document = PDFDocument.objects.create(
+            id=cls.test_uuid,
             original_filename='test.pdf',
             file_checksum='test_checksum_summary',
             file_size=1024,
@@ -250,10 +259,10 @@ class SummaryFragmentTest(TestCase):
         """
         Checks that summary fragment handles missing summary gracefully.
         """
-        url = reverse('summary_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        response = self.client.get(self.summary_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'Suggestions coming soon')
+        self.assertEqual('no-store', response['Cache-Control'])
 
     def test_summary_fragment_accessible_hides_section(self):
         """
@@ -278,8 +287,7 @@ class SummaryFragmentTest(TestCase):
             validation_profile='PDF/UA-1',
             verapdf_version='1.0',
         )
-        url = reverse('summary_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        response = self.client.get(self.summary_url)
         self.assertEqual(200, response.status_code)
         self.assertNotContains(response, 'Accessibility Improvement Suggestions')
 
@@ -291,8 +299,7 @@ class SummaryFragmentTest(TestCase):
             pdf_document=self.document,
             status='pending',
         )
-        url = reverse('summary_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        response = self.client.get(self.summary_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'hx-get')
         self.assertContains(response, 'queued for generation')
@@ -305,8 +312,7 @@ class SummaryFragmentTest(TestCase):
             pdf_document=self.document,
             status='processing',
         )
-        url = reverse('summary_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        response = self.client.get(self.summary_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'hx-get')
         self.assertContains(response, 'Generating suggestions')
@@ -321,14 +327,31 @@ class SummaryFragmentTest(TestCase):
             summary_text='This is a test summary.',
             model='gpt-4',
         )
-        url = reverse('summary_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.summary_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'This is a test summary')
         self.assertContains(response, 'gpt-4')
         ## Should not have polling attributes
         self.assertNotContains(response, 'hx-trigger="every')
 
+    def test_summary_fragment_loads_relations_in_one_query(self):
+        """
+        Checks that the summary fragment fetches the document, veraPDF result, and summary in a single query.
+        """
+        VeraPDFResult.objects.create(
+            pdf_document=self.document,
+            raw_json={'report': {'jobs': [{'validationResult': [{'compliant': False}]}]}},
+            is_accessible=False,
+            validation_profile='PDF/UA-1',
+            verapdf_version='1.0',
+        )
+        OpenRouterSummary.objects.create(pdf_document=self.document, status='completed', summary_text='Fix headings.')
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get(self.summary_url)
+        self.assertContains(response, 'Fix headings.')
+        self.assertNotIn('"raw_json_pretty"', queries.captured_queries[0]['sql'])
+
     def test_summary_fragment_failed(self):
         """
         Checks that summary fragment shows failed state.
@@ -338,15 +361,6 @@ class SummaryFragmentTest(TestCase):
             status='failed',
             error='API error',
         )
-        url = reverse('summary_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
+        response = self.client.get(self.summary_url)
         self.assertEqual(200, response.status_code)
         self.assertContains(response, 'Suggestion generation failed')
-
-    def test_summary_fragment_cache_control(self):
-        """
-        Checks that summary fragment sets Cache-Control header.
-        """
-        url = reverse('summary_fragment_url', kwargs={'pk': self.test_uuid})
-        response = self.client.get(url)
-        self.assertEqual('no-store', response['Cache-Control'])
@@ -2,14 +2,20 @@
 Tests for synchronous PDF processing with timeout fallback.
 """
 
+import functools
 import logging
-from datetime import datetime, timedelta
+import tempfile
+import threading
+from datetime import timedelta
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import DEFAULT, MagicMock, patch
 
 import httpx
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.utils import timezone as django_timezone
 
+from pdf_checker_app.lib import openrouter_helpers, pdf_helpers
 from pdf_checker_app.lib.pdf_helpers import VeraPDFTimeoutError
 from pdf_checker_app.lib.sync_processing_helpers import (
     attempt_openrouter_sync,
@@ -17,26 +23,89 @@ from pdf_checker_app.lib.sync_processing_helpers import (
     attempt_verapdf_sync,
 )
 from pdf_checker_app.models import OpenRouterSummary, PDFDocument, VeraPDFResult
+from scripts import process_openrouter_summaries, process_verapdf_jobs
+from scripts.process_openrouter_summaries import find_pending_summaries, process_single_summary
+from scripts.process_verapdf_jobs import find_pending_jobs
 
 log = logging.getLogger(__name__)
 
 
+MOCK_OPENROUTER_RESPONSE: dict[str, object] = {
+    'id': 'test-id',
+    'provider': 'test-provider',
+    'model': 'test-model',
+    'choices': [{'message': {'content': 'Test summary'}, 'finish_reason': 'stop'}],
+    'usage': {'prompt_tokens': 10, 'completion_tokens': 20, 'total_tokens': 30},
+    'created': 1234567890,
+}
+MOCK_OPENROUTER_PARSED: dict[str, object] = {
+    'summary_text': 'Test summary',
+    'openrouter_response_id': 'test-id',
+    'provider': 'test-provider',
+    'model': 'test-model',
+    'finish_reason': 'stop',
+    'openrouter_created_at': None,
+    'prompt_tokens': 10,
+    'completion_tokens': 20,
+    'total_tokens': 30,
+}
+OPENROUTER_HELPERS_TARGET = 'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers'
+OPENROUTER_HELPER_NAMES: tuple[str, ...] = (
+    'get_api_key',
+    'get_model_order',
+    'filter_down_failure_checks',
+    'build_prompt',
+    'call_openrouter',
+    'parse_openrouter_response',
+    'persist_openrouter_summary',
+)
+OPENROUTER_HELPER_RETURN_VALUES: dict[str, object] = {
+    'get_api_key': 'test-key',
+    'get_model_order': ['test-model'],
+    'filter_down_failure_checks': {},
+    'build_prompt': 'test prompt',
+}
+
+
+def wait_for_other_workers(barrier: threading.Barrier, doc: PDFDocument, *_args: object) -> bool:
+    """
+    Stands in for a cron script's per-document processor: blocks until every worker has a document, then fails doc1.
+    A serial run never gets past the barrier, so it raises threading.BrokenBarrierError once the barrier times out.
+    """
+    barrier.wait()
+    return doc.original_filename != 'doc1.pdf'
+
+
+def patch_openrouter_helpers(**overrides):
+    """
+    Patches the openrouter helpers used by `attempt_openrouter_sync()` in one context manager.
+    Defaults supply credentials and a prompt; pass keyword overrides to customize individual helpers.
+    The yielded dict maps helper names to their mocks.
+    """
+    patches: dict[str, object] = {name: DEFAULT for name in OPENROUTER_HELPER_NAMES}
+    for name, return_value in OPENROUTER_HELPER_RETURN_VALUES.items():
+        patches[name] = MagicMock(return_value=return_value)
+    patches.update(overrides)
+    return patch.multiple(OPENROUTER_HELPERS_TARGET, **patches)
+
+
 class SyncVeraPDFProcessingTest(TestCase):
     """
     Checks synchronous veraPDF processing with timeout handling.
     """
 
-    def setUp(self) -> None:
+    @classmethod
+    def setUpTestData(cls) -> None:
         """
         Creates a test document.
         """
-        self.doc = PDFDocument.objects.create(
+        cls.doc = PDFDocument.objects.create(
             original_filename='test.pdf',
             file_checksum='abc123',
             file_size=1024,
             processing_status='pending',
         )
-        self.pdf_path = Path('/tmp/test.pdf')
+        cls.pdf_path = Path('/tmp/test.pdf')
 
     def test_verapdf_sync_success(self) -> None:
         """
@@ -45,12 +114,13 @@ class SyncVeraPDFProcessingTest(TestCase):
         mock_output = '{"jobs": []}'
         mock_parsed = {'jobs': []}
 
-        with patch('pdf_checker_app.lib.sync_processing_helpers.pdf_helpers.run_verapdf', return_value=mock_output):
-            with patch(
-                'pdf_checker_app.lib.sync_processing_helpers.pdf_helpers.parse_verapdf_output', return_value=mock_parsed
-            ):
-                with patch('pdf_checker_app.lib.sync_processing_helpers.pdf_helpers.save_verapdf_result'):
-                    result = attempt_verapdf_sync(self.doc, self.pdf_path)
+        with patch.multiple(
+            'pdf_checker_app.lib.sync_processing_helpers.pdf_helpers',
+            run_verapdf=MagicMock(return_value=mock_output),
+            parse_verapdf_output=MagicMock(return_value=mock_parsed),
+            save_verapdf_result=DEFAULT,
+        ):
+            result = attempt_verapdf_sync(self.doc, self.pdf_path)
 
         self.assertTrue(result)
         self.doc.refresh_from_db()
@@ -92,142 +162,121 @@ class SyncOpenRouterProcessingTest(TestCase):
     Checks synchronous OpenRouter processing with timeout handling.
     """
 
-    def setUp(self) -> None:
+    @classmethod
+    def setUpTestData(cls) -> None:
         """
         Creates a test document with veraPDF result.
         """
-        self.doc = PDFDocument.objects.create(
+        cls.doc = PDFDocument.objects.create(
             original_filename='test.pdf',
             file_checksum='abc123',
             file_size=1024,
             processing_status='completed',
         )
-        self.verapdf_result = VeraPDFResult.objects.create(
-            pdf_document=self.doc,
+        cls.verapdf_result = VeraPDFResult.objects.create(
+            pdf_document=cls.doc,
             raw_json={'jobs': []},
             is_accessible=True,
             validation_profile='PDF/UA-1',
             verapdf_version='1.0',
         )
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Patches the openrouter helpers once for the whole class; tests adjust the shared mocks.
+        """
+        super().setUpClass()
+        patcher = patch.multiple(OPENROUTER_HELPERS_TARGET, **dict.fromkeys(OPENROUTER_HELPER_NAMES, DEFAULT))
+        cls.mocks = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+
+    def setUp(self) -> None:
+        """
+        Resets the shared mocks and restores their default return values.
+        """
+        for name, mock in self.mocks.items():
+            mock.reset_mock(return_value=True, side_effect=True)
+            if name in OPENROUTER_HELPER_RETURN_VALUES:
+                mock.return_value = OPENROUTER_HELPER_RETURN_VALUES[name]
+
     def test_openrouter_sync_success(self) -> None:
         """
         Checks that successful OpenRouter updates summary to 'completed'.
         """
-        mock_response = {
-            'id': 'test-id',
-            'provider': 'test-provider',
-            'model': 'test-model',
-            'choices': [{'message': {'content': 'Test summary'}, 'finish_reason': 'stop'}],
-            'usage': {'prompt_tokens': 10, 'completion_tokens': 20, 'total_tokens': 30},
-            'created': 1234567890,
-        }
-        mock_parsed = {
-            'summary_text': 'Test summary',
-            'openrouter_response_id': 'test-id',
-            'provider': 'test-provider',
-            'model': 'test-model',
-            'finish_reason': 'stop',
-            'openrouter_created_at': None,
-            'prompt_tokens': 10,
-            'completion_tokens': 20,
-            'total_tokens': 30,
-        }
-
-        with patch('pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_api_key', return_value='test-key'):
-            with patch(
-                'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_model_order',
-                return_value=['test-model'],
-            ):
-                with patch(
-                    'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.filter_down_failure_checks',
-                    return_value={},
-                ):
-                    with patch(
-                        'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.build_prompt',
-                        return_value='test prompt',
-                    ):
-                        with patch(
-                            'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.call_openrouter',
-                            return_value=mock_response,
-                        ):
-                            with patch(
-                                'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.parse_openrouter_response',
-                                return_value=mock_parsed,
-                            ):
-                                with patch(
-                                    'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.persist_openrouter_summary'
-                                ):
-                                    result = attempt_openrouter_sync(self.doc)
+        self.mocks['call_openrouter'].return_value = MOCK_OPENROUTER_RESPONSE
+        self.mocks['parse_openrouter_response'].return_value = MOCK_OPENROUTER_PARSED
+        result = attempt_openrouter_sync(self.doc, self.verapdf_result)
 
         self.assertTrue(result)
+        self.mocks['persist_openrouter_summary'].assert_called_once()
 
     def test_openrouter_sync_timeout_fallback(self) -> None:
         """
         Checks that OpenRouter timeout sets summary status to 'pending'.
         """
-        with patch('pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_api_key', return_value='test-key'):
-            with patch(
-                'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_model_order',
-                return_value=['test-model'],
-            ):
-                with patch(
-                    'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.filter_down_failure_checks',
-                    return_value={},
-                ):
-                    with patch(
-                        'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.build_prompt',
-                        return_value='test prompt',
-                    ):
-                        with patch(
-                            'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.call_openrouter',
-                            side_effect=httpx.TimeoutException('timeout'),
-                        ):
-                            result = attempt_openrouter_sync(self.doc)
+        self.mocks['call_openrouter'].side_effect = httpx.TimeoutException('timeout')
+        result = attempt_openrouter_sync(self.doc, self.verapdf_result)
 
         self.assertFalse(result)
         summary = OpenRouterSummary.objects.get(pdf_document=self.doc)
         self.assertEqual(summary.status, 'pending')
         self.assertIn('timed out', summary.error)
+        self.assertEqual('test prompt', summary.prompt)
 
     def test_openrouter_sync_error_marks_failed(self) -> None:
         """
         Checks that non-timeout errors mark summary as 'failed'.
         """
-        with patch('pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_api_key', return_value='test-key'):
-            with patch(
-                'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_model_order',
-                return_value=['test-model'],
-            ):
-                with patch(
-                    'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.filter_down_failure_checks',
-                    return_value={},
-                ):
-                    with patch(
-                        'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.build_prompt',
-                        return_value='test prompt',
-                    ):
-                        with patch(
-                            'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.call_openrouter',
-                            side_effect=Exception('API error'),
-                        ):
-                            result = attempt_openrouter_sync(self.doc)
+        self.mocks['call_openrouter'].side_effect = Exception('API error')
+        result = attempt_openrouter_sync(self.doc, self.verapdf_result)
 
         self.assertFalse(result)
         summary = OpenRouterSummary.objects.get(pdf_document=self.doc)
         self.assertEqual(summary.status, 'failed')
         self.assertIn('API error', summary.error)
 
+    def test_openrouter_sync_prompt_failure_records_failed_summary(self) -> None:
+        """
+        Checks that a prompt-building failure leaves a 'failed' summary with the error, and never calls the API.
+        """
+        self.mocks['build_prompt'].side_effect = ValueError('bad veraPDF JSON')
+        result = attempt_openrouter_sync(self.doc, self.verapdf_result)
+
+        self.assertFalse(result)
+        self.mocks['call_openrouter'].assert_not_called()
+        summary = OpenRouterSummary.objects.get(pdf_document=self.doc)
+        self.assertEqual(('failed', 'bad veraPDF JSON'), (summary.status, summary.error))
+
+    def test_openrouter_sync_resets_existing_failed_summary(self) -> None:
+        """
+        Checks that a retry resets an existing failed summary's status, error, and prompt before calling the API.
+        """
+        OpenRouterSummary.objects.create(pdf_document=self.doc, status='failed', error='old error', prompt='old prompt')
+        self.mocks['build_prompt'].return_value = 'new prompt'
+        result = attempt_openrouter_sync(self.doc, self.verapdf_result)
+
+        self.assertTrue(result)
+        summary = OpenRouterSummary.objects.get(pdf_document=self.doc)
+        self.assertEqual('processing', summary.status)
+        self.assertIsNone(summary.error)
+        self.assertEqual('new prompt', summary.prompt)
+        self.assertEqual(1, OpenRouterSummary.objects.count())
+
+
+class SyncOpenRouterNoDBTest(SimpleTestCase):
+    """
+    Checks synchronous OpenRouter paths that return before touching the database.
+    """
+
     def test_openrouter_skipped_without_credentials(self) -> None:
         """
         Checks that OpenRouter is skipped if credentials are missing.
         """
-        with patch('pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_api_key', return_value=''):
-            with patch(
-                'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_model_order',
-                return_value=['test-model'],
-            ):
-                result = attempt_openrouter_sync(self.doc)
+        doc = PDFDocument(original_filename='test.pdf', file_checksum='abc123', file_size=1024)
+        verapdf_result = VeraPDFResult(pdf_document=doc, raw_json={'jobs': []}, is_accessible=False)
+        with patch_openrouter_helpers(get_api_key=MagicMock(return_value='')):
+            result = attempt_openrouter_sync(doc, verapdf_result)
 
         self.assertFalse(result)
 
@@ -237,56 +286,130 @@ class CronSelectionLogicTest(TestCase):
     Checks cron job selection logic with stuck processing recovery.
     """
 
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """
+        Seeds one pending, one freshly-started, and one stuck document in a single INSERT, then runs the selection once.
+        """
+        now = django_timezone.now()
+        cls.pending_doc, cls.fresh_doc, cls.stuck_doc = PDFDocument.objects.bulk_create(
+            [
+                PDFDocument(
+                    original_filename='pending.pdf',
+                    file_checksum='pending_checksum',
+                    file_size=1024,
+                    processing_status='pending',
+                    processing_error='old error',
+                ),
+                PDFDocument(
+                    original_filename='fresh.pdf',
+                    file_checksum='fresh_checksum',
+                    file_size=1024,
+                    processing_status='processing',
+                    processing_started_at=now,
+                ),
+                PDFDocument(
+                    original_filename='stuck.pdf',
+                    file_checksum='stuck_checksum',
+                    file_size=1024,
+                    processing_status='processing',
+                    processing_started_at=now - timedelta(minutes=20),
+                ),
+            ]
+        )
+        cls.selected_pks = {doc.pk for doc in find_pending_jobs(batch_size=10)}
+
     def test_find_pending_jobs_includes_pending(self) -> None:
         """
         Checks that pending documents are selected.
         """
-        doc = PDFDocument.objects.create(
-            original_filename='test.pdf',
-            file_checksum='abc123',
-            file_size=1024,
-            processing_status='pending',
-        )
-
-        from scripts.process_verapdf_jobs import find_pending_jobs
-
-        jobs = find_pending_jobs(batch_size=10)
-        self.assertIn(doc, jobs)
+        self.assertIn(self.pending_doc.pk, self.selected_pks)
 
     def test_find_pending_jobs_skips_fresh_processing(self) -> None:
         """
         Checks that recently started processing jobs are skipped.
         """
-        doc = PDFDocument.objects.create(
-            original_filename='test.pdf',
-            file_checksum='abc123',
-            file_size=1024,
-            processing_status='processing',
-            processing_started_at=datetime.now(),
-        )
-
-        from scripts.process_verapdf_jobs import find_pending_jobs
-
-        jobs = find_pending_jobs(batch_size=10)
-        self.assertNotIn(doc, jobs)
+        self.assertNotIn(self.fresh_doc.pk, self.selected_pks)
 
     def test_find_pending_jobs_includes_stuck_processing(self) -> None:
         """
         Checks that old processing jobs are selected for recovery.
         """
-        stuck_time = datetime.now() - timedelta(minutes=20)
-        doc = PDFDocument.objects.create(
-            original_filename='test.pdf',
-            file_checksum='abc123',
-            file_size=1024,
-            processing_status='processing',
-            processing_started_at=stuck_time,
-        )
+        self.assertIn(self.stuck_doc.pk, self.selected_pks)
 
-        from scripts.process_verapdf_jobs import find_pending_jobs
+    def test_find_pending_jobs_claim_marks_batch_processing(self) -> None:
+        """
+        Checks that claiming marks every selected document 'processing' with a queryset update, not per-row saves.
+        """
+        with patch.object(PDFDocument, 'save') as mock_save:
+            ## savepoint, pending SELECT, stuck SELECT, claim UPDATE, release; one query per batch step, not per row
+            with self.assertNumQueries(5):
+                jobs = find_pending_jobs(batch_size=10, claim=True)
+        mock_save.assert_not_called()
+        self.assertEqual({self.pending_doc.pk, self.stuck_doc.pk}, {doc.pk for doc in jobs})
+        self.assertTrue(all(doc.processing_status == 'processing' for doc in jobs))
+        pending_doc = PDFDocument.objects.get(pk=self.pending_doc.pk)
+        self.assertEqual('processing', pending_doc.processing_status)
+        self.assertIsNone(pending_doc.processing_error)
+        self.assertIsNotNone(pending_doc.processing_started_at)
 
-        jobs = find_pending_jobs(batch_size=10)
-        self.assertIn(doc, jobs)
+    def record_overlapping_selection(self, *_args, **_kwargs) -> None:
+        """
+        Stands in for run_verapdf(): records what an overlapping cron run would select, then fails the job.
+        """
+        self.overlapping_pks = {doc.pk for doc in find_pending_jobs(batch_size=10)}
+        raise RuntimeError('veraPDF stand-in')
+
+    def test_process_single_job_restamps_start_so_late_batch_job_is_not_stuck(self) -> None:
+        """
+        Checks that a job claimed long before its turn in the batch is re-stamped on start, so it isn't re-selected as stuck.
+        """
+        (job,) = find_pending_jobs(batch_size=1, claim=True)
+        ## simulate the job waiting behind a long batch: its claim stamp is now older than the recovery threshold
+        PDFDocument.objects.filter(pk=job.pk).update(processing_started_at=django_timezone.now() - timedelta(minutes=20))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / f'{job.file_checksum}.pdf').write_bytes(b'%PDF-1.4')
+            with override_settings(PDF_UPLOAD_PATH=temp_dir):
+                with patch.object(pdf_helpers, 'run_verapdf', side_effect=self.record_overlapping_selection):
+                    self.assertFalse(process_verapdf_jobs.process_single_job(job, Path('/bin/echo')))
+        self.assertNotIn(job.pk, self.overlapping_pks)
+
+
+class VeraPDFCronProcessingTest(SimpleTestCase):
+    """
+    Checks veraPDF cron batch processing.
+    """
+
+    def test_process_jobs_runs_documents_concurrently(self) -> None:
+        """
+        Checks that process_jobs() with max_workers > 1 runs the claimed documents at the same time and tallies the results.
+        """
+        docs = [PDFDocument(original_filename=f'doc{i}.pdf', file_checksum=f'checksum{i}', file_size=1) for i in range(3)]
+        ## each call waits for the other two, so a serial run would time out on the barrier
+        mock_process = MagicMock(side_effect=functools.partial(wait_for_other_workers, threading.Barrier(3, timeout=5)))
+        with patch.multiple(
+            process_verapdf_jobs,
+            find_pending_jobs=MagicMock(return_value=docs),
+            process_single_job=mock_process,
+        ):
+            counts = process_verapdf_jobs.process_jobs(3, dry_run=False, max_workers=3)
+        self.assertEqual((2, 1), counts)
+        self.assertEqual({doc.pk for doc in docs}, {call.args[0].pk for call in mock_process.call_args_list})
+
+    def test_process_jobs_runs_a_single_document_without_a_pool(self) -> None:
+        """
+        Checks that a one-document batch runs in the calling thread even with max_workers > 1, as process_summaries() does.
+        """
+        doc = PDFDocument(original_filename='doc0.pdf', file_checksum='checksum0', file_size=1)
+        with patch.multiple(
+            process_verapdf_jobs,
+            find_pending_jobs=MagicMock(return_value=[doc]),
+            process_single_job=MagicMock(return_value=True),
+            ThreadPoolExecutor=DEFAULT,
+        ) as mocks:
+            counts = process_verapdf_jobs.process_jobs(3, dry_run=False, max_workers=3)
+        self.assertEqual((1, 0), counts)
+        mocks['ThreadPoolExecutor'].assert_not_called()
 
 
 class OpenRouterCronSelectionTest(TestCase):
@@ -312,8 +435,6 @@ class OpenRouterCronSelectionTest(TestCase):
             verapdf_version='1.0',
         )
 
-        from scripts.process_openrouter_summaries import find_pending_summaries
-
         result = find_pending_summaries(batch_size=10)
         self.assertNotIn(accessible_doc, result)
 
@@ -335,28 +456,245 @@ class OpenRouterCronSelectionTest(TestCase):
             verapdf_version='1.0',
         )
 
-        from scripts.process_openrouter_summaries import find_pending_summaries
-
         result = find_pending_summaries(batch_size=10)
         self.assertIn(doc, result)
 
+    def test_find_pending_summaries_selects_by_summary_status_in_one_query(self) -> None:
+        """
+        Checks that missing, pending, and failed summaries are selected oldest-first in a single query.
+        The query leaves out the large columns the cron doesn't read.
+        """
+        docs: dict[str, PDFDocument] = {}
+        for label in ('missing', 'pending', 'failed', 'processing', 'completed'):
+            docs[label] = PDFDocument.objects.create(
+                original_filename=f'{label}.pdf',
+                file_checksum=f'{label}_checksum',
+                file_size=1024,
+                processing_status='completed',
+            )
+            VeraPDFResult.objects.create(
+                pdf_document=docs[label],
+                raw_json={'jobs': []},
+                is_accessible=False,
+                validation_profile='PDF/UA-1',
+                verapdf_version='1.0',
+            )
+            if label != 'missing':
+                OpenRouterSummary.objects.create(pdf_document=docs[label], status=label)
+
+        with self.assertNumQueries(1) as queries:
+            result = list(find_pending_summaries(batch_size=10))
+        self.assertEqual([docs['missing'], docs['pending'], docs['failed']], result)
+        for column in ('"raw_json_pretty"', '"raw_response_json"', '"user_groups"'):
+            self.assertNotIn(column, queries.captured_queries[0]['sql'])
+        self.assertEqual(2, len(find_pending_summaries(batch_size=2)))
+
+
+class OpenRouterCronProcessingTest(TestCase):
+    """
+    Checks OpenRouter summary cron processing of a single document.
+    """
+
+    def test_process_single_summary_rebuilds_prompt_saved_by_earlier_attempt(self) -> None:
+        """
+        Checks that a retry rebuilds the prompt from the current veraPDF result instead of resending a stale saved one.
+        """
+        doc = PDFDocument.objects.create(
+            original_filename='retry.pdf',
+            file_checksum='retry_checksum',
+            file_size=1024,
+            processing_status='completed',
+        )
+        VeraPDFResult.objects.create(
+            pdf_document=doc,
+            raw_json={'jobs': []},
+            is_accessible=False,
+            validation_profile='PDF/UA-1',
+            verapdf_version='1.0',
+        )
+        OpenRouterSummary.objects.create(pdf_document=doc, status='failed', prompt='stale prompt')
+        (selected_doc,) = find_pending_summaries(batch_size=10)
+
+        with patch(
+            'scripts.process_openrouter_summaries.openrouter_helpers.build_prompt', return_value='fresh prompt'
+        ) as mock_build_prompt:
+            with patch(
+                'scripts.process_openrouter_summaries.openrouter_helpers.call_openrouter_with_model_order',
+                return_value={'choices': [{'message': {'content': 'Suggestions.'}}]},
+            ) as mock_call:
+                self.assertTrue(process_single_summary(selected_doc, 'test-key', ('test/model',)))
+        mock_build_prompt.assert_called_once()
+        self.assertEqual('fresh prompt', mock_call.call_args.args[0])
+        summary = OpenRouterSummary.objects.get(pdf_document=doc)
+        self.assertEqual(('completed', 'fresh prompt'), (summary.status, summary.prompt))
+
+    def test_process_single_summary_uses_rows_joined_by_find_pending_summaries(self) -> None:
+        """
+        Checks that a selected document's veraPDF result and summary are not re-queried; only the writes hit the DB.
+        """
+        doc = PDFDocument.objects.create(
+            original_filename='joined.pdf',
+            file_checksum='joined_checksum',
+            file_size=1024,
+            processing_status='completed',
+        )
+        VeraPDFResult.objects.create(
+            pdf_document=doc,
+            raw_json={'jobs': []},
+            is_accessible=False,
+            validation_profile='PDF/UA-1',
+            verapdf_version='1.0',
+        )
+        OpenRouterSummary.objects.create(pdf_document=doc, status='failed')
+        (selected_doc,) = find_pending_summaries(batch_size=10)
+
+        with patch(
+            'scripts.process_openrouter_summaries.openrouter_helpers.call_openrouter_with_model_order',
+            return_value={'choices': [{'message': {'content': 'Suggestions.'}}]},
+        ):
+            ## mark 'processing' with the built prompt, then persist the response
+            with self.assertNumQueries(2):
+                self.assertTrue(process_single_summary(selected_doc, 'test-key', ('test/model',)))
+        summary = OpenRouterSummary.objects.get(pdf_document=doc)
+        self.assertEqual('completed', summary.status)
+        self.assertTrue(summary.prompt)
+
+    def test_process_single_summary_prompt_failure_records_failed_summary(self) -> None:
+        """
+        Checks that a prompt-building failure for a document without a summary still leaves a 'failed' summary row.
+        """
+        doc = PDFDocument.objects.create(
+            original_filename='no_result.pdf',
+            file_checksum='no_result_checksum',
+            file_size=1024,
+            processing_status='completed',
+        )
+        self.assertFalse(process_single_summary(doc, 'test-key', ('test/model',)))
+        summary = OpenRouterSummary.objects.get(pdf_document=doc)
+        self.assertEqual('failed', summary.status)
+        self.assertTrue(summary.error)
+
+    def test_persist_openrouter_summary_writes_only_response_fields(self) -> None:
+        """
+        Checks that persisting a response leaves the saved prompt alone, even if the in-memory copy differs.
+        """
+        doc = PDFDocument.objects.create(
+            original_filename='persist.pdf',
+            file_checksum='persist_checksum',
+            file_size=1024,
+            processing_status='completed',
+        )
+        summary = OpenRouterSummary.objects.create(pdf_document=doc, status='processing', prompt='saved prompt')
+        summary.prompt = 'unsaved in-memory prompt'
+        response_json = {'id': 'gen-1', 'choices': [{'message': {'content': 'Fix tags.'}}]}
+        parsed = openrouter_helpers.parse_openrouter_response(response_json)
+        openrouter_helpers.persist_openrouter_summary(summary, response_json, parsed)
+        summary.refresh_from_db()
+        self.assertEqual('saved prompt', summary.prompt)
+        self.assertEqual('completed', summary.status)
+        self.assertEqual('Fix tags.', summary.summary_text)
+        self.assertEqual(response_json, summary.raw_response_json)
+
+    def test_process_summaries_runs_documents_concurrently(self) -> None:
+        """
+        Checks that process_summaries() with max_workers > 1 runs the documents at the same time and tallies the results.
+        """
+        docs = [PDFDocument(original_filename=f'doc{i}.pdf', file_checksum=f'checksum{i}', file_size=1) for i in range(3)]
+        ## each call waits for the other two, so a serial run would time out on the barrier
+        mock_process = MagicMock(side_effect=functools.partial(wait_for_other_workers, threading.Barrier(3, timeout=5)))
+        with patch.multiple(
+            process_openrouter_summaries,
+            get_api_key=MagicMock(return_value='test-key'),
+            get_model_order=MagicMock(return_value=('test/model',)),
+            find_pending_summaries=MagicMock(return_value=docs),
+            process_single_summary=mock_process,
+        ):
+            counts = process_openrouter_summaries.process_summaries(3, dry_run=False, max_workers=3)
+        self.assertEqual((2, 1), counts)
+        self.assertEqual(3, mock_process.call_count)
+        self.assertEqual({doc.pk for doc in docs}, {call.args[0].pk for call in mock_process.call_args_list})
+
+    def test_process_summaries_serial_run_summarizes_every_selected_document(self) -> None:
+        """
+        Checks that a serial run summarizes every selected document.
+        """
+        for i in range(3):
+            doc = PDFDocument.objects.create(
+                original_filename=f'serial{i}.pdf',
+                file_checksum=f'serial_checksum{i}',
+                file_size=1024,
+                processing_status='completed',
+            )
+            VeraPDFResult.objects.create(
+                pdf_document=doc,
+                raw_json={'jobs': []},
+                is_accessible=False,
+                validation_profile='PDF/UA-1',
+                verapdf_version='1.0',
+            )
+        with patch.multiple(
+            process_openrouter_summaries,
+            get_api_key=MagicMock(return_value='test-key'),
+            get_model_order=MagicMock(return_value=('test/model',)),
+        ):
+            with patch.object(
+                openrouter_helpers,
+                'call_openrouter_with_retries',
+                return_value={'choices': [{'message': {'content': 'Suggestions.'}}]},
+            ):
+                counts = process_openrouter_summaries.process_summaries(10, dry_run=False)
+        self.assertEqual((3, 0), counts)
+        self.assertEqual(3, OpenRouterSummary.objects.filter(status='completed').count())
+
+
+class SaveVeraPDFResultTest(TestCase):
+    """
+    Checks veraPDF result persistence on first runs and re-runs.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """
+        Creates a test document.
+        """
+        cls.doc = PDFDocument.objects.create(
+            original_filename='rerun.pdf',
+            file_checksum='rerun_checksum',
+            file_size=1024,
+            processing_status='processing',
+        )
+        cls.raw_json = {'report': {'jobs': [{'validationResult': [{'compliant': False}]}]}}
+
+    def test_rerun_with_changed_output_rewrites_raw_json(self) -> None:
+        """
+        Checks that re-saving different veraPDF output rewrites raw_json, its display form, and is_accessible.
+        """
+        pdf_helpers.save_verapdf_result(self.doc.id, self.raw_json)
+        new_raw_json = {'report': {'jobs': [{'validationResult': [{'compliant': True}]}]}}
+        pdf_helpers.save_verapdf_result(self.doc.id, new_raw_json)
+        result = VeraPDFResult.objects.get(pdf_document=self.doc)
+        self.assertEqual(new_raw_json, result.raw_json)
+        self.assertEqual(pdf_helpers.format_verapdf_json(new_raw_json), result.raw_json_pretty)
+        self.assertTrue(result.is_accessible)
+
 
 class FullSyncProcessingTest(TestCase):
     """
     Checks full synchronous processing orchestration.
     """
 
-    def setUp(self) -> None:
+    @classmethod
+    def setUpTestData(cls) -> None:
         """
         Creates a test document.
         """
-        self.doc = PDFDocument.objects.create(
+        cls.doc = PDFDocument.objects.create(
             original_filename='test.pdf',
             file_checksum='abc123',
             file_size=1024,
             processing_status='pending',
         )
-        self.pdf_path = Path('/tmp/test.pdf')
+        cls.pdf_path = Path('/tmp/test.pdf')
 
     def test_full_sync_success_path(self) -> None:
         """
@@ -364,25 +702,6 @@ class FullSyncProcessingTest(TestCase):
         """
         mock_verapdf_output = '{"jobs": []}'
         mock_verapdf_parsed = {'jobs': []}
-        mock_openrouter_response = {
-            'id': 'test-id',
-            'provider': 'test-provider',
-            'model': 'test-model',
-            'choices': [{'message': {'content': 'Test summary'}, 'finish_reason': 'stop'}],
-            'usage': {'prompt_tokens': 10, 'completion_tokens': 20, 'total_tokens': 30},
-            'created': 1234567890,
-        }
-        mock_openrouter_parsed = {
-            'summary_text': 'Test summary',
-            'openrouter_response_id': 'test-id',
-            'provider': 'test-provider',
-            'model': 'test-model',
-            'finish_reason': 'stop',
-            'openrouter_created_at': None,
-            'prompt_tokens': 10,
-            'completion_tokens': 20,
-            'total_tokens': 30,
-        }
 
         def create_verapdf_result(*args, **kwargs):
             VeraPDFResult.objects.create(
@@ -393,42 +712,18 @@ class FullSyncProcessingTest(TestCase):
                 verapdf_version='1.0',
             )
 
-        with patch('pdf_checker_app.lib.sync_processing_helpers.pdf_helpers.run_verapdf', return_value=mock_verapdf_output):
-            with patch(
-                'pdf_checker_app.lib.sync_processing_helpers.pdf_helpers.parse_verapdf_output',
-                return_value=mock_verapdf_parsed,
-            ):
-                with patch(
-                    'pdf_checker_app.lib.sync_processing_helpers.pdf_helpers.save_verapdf_result',
-                    side_effect=create_verapdf_result,
-                ):
-                    with patch(
-                        'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_api_key', return_value='test-key'
-                    ):
-                        with patch(
-                            'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.get_model_order',
-                            return_value=['test-model'],
-                        ):
-                            with patch(
-                                'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.filter_down_failure_checks',
-                                return_value={},
-                            ):
-                                with patch(
-                                    'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.build_prompt',
-                                    return_value='test prompt',
-                                ):
-                                    with patch(
-                                        'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.call_openrouter',
-                                        return_value=mock_openrouter_response,
-                                    ):
-                                        with patch(
-                                            'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.parse_openrouter_response',
-                                            return_value=mock_openrouter_parsed,
-                                        ):
-                                            with patch(
-                                                'pdf_checker_app.lib.sync_processing_helpers.openrouter_helpers.persist_openrouter_summary'
-                                            ):
-                                                attempt_synchronous_processing(self.doc, self.pdf_path)
+        verapdf_patches = patch.multiple(
+            'pdf_checker_app.lib.sync_processing_helpers.pdf_helpers',
+            run_verapdf=MagicMock(return_value=mock_verapdf_output),
+            parse_verapdf_output=MagicMock(return_value=mock_verapdf_parsed),
+            save_verapdf_result=MagicMock(side_effect=create_verapdf_result),
+        )
+        openrouter_patches = patch_openrouter_helpers(
+            call_openrouter=MagicMock(return_value=MOCK_OPENROUTER_RESPONSE),
+            parse_openrouter_response=MagicMock(return_value=MOCK_OPENROUTER_PARSED),
+        )
+        with verapdf_patches, openrouter_patches:
+            attempt_synchronous_processing(self.doc, self.pdf_path)
 
         self.doc.refresh_from_db()
         self.assertEqual(self.doc.processing_status, 'completed')
@@ -458,6 +753,22 @@ class FullSyncProcessingTest(TestCase):
 
         mock_openrouter.assert_not_called()
 
+    def test_sync_accessible_check_does_not_load_raw_json(self) -> None:
+        """
+        Checks that the accessibility check after veraPDF defers raw_json, so the skip path never transfers it.
+        """
+        VeraPDFResult.objects.create(
+            pdf_document=self.doc,
+            raw_json={'jobs': []},
+            is_accessible=True,
+            validation_profile='PDF/UA-1',
+            verapdf_version='1.0',
+        )
+        with patch('pdf_checker_app.lib.sync_processing_helpers.attempt_verapdf_sync', return_value=True):
+            with self.assertNumQueries(2) as queries:  # processing-status UPDATE, then the deferred result SELECT
+                attempt_synchronous_processing(self.doc, self.pdf_path)
+        self.assertNotIn('"raw_json"', queries.captured_queries[-1]['sql'])
+
     def test_sync_runs_openrouter_when_not_accessible(self) -> None:
         """
         Checks that OpenRouter runs when veraPDF marks the PDF not accessible.
@@ -481,6 +792,30 @@ class FullSyncProcessingTest(TestCase):
                 attempt_synchronous_processing(self.doc, self.pdf_path)
 
         mock_openrouter.assert_called_once()
+        self.assertEqual(self.doc.pk, mock_openrouter.call_args.args[1].pdf_document_id)
+
+    @override_settings(OPENROUTER_SYNC_ENABLED=False)
+    def test_sync_openrouter_disabled_queues_pending_summary(self) -> None:
+        """
+        Checks that with OPENROUTER_SYNC_ENABLED off, no API call is made and a pending summary is left for cron.
+        """
+        VeraPDFResult.objects.create(
+            pdf_document=self.doc,
+            raw_json={'jobs': []},
+            is_accessible=False,
+            validation_profile='PDF/UA-1',
+            verapdf_version='1.0',
+        )
+        with patch.multiple(
+            'pdf_checker_app.lib.sync_processing_helpers',
+            attempt_verapdf_sync=MagicMock(return_value=True),
+            attempt_openrouter_sync=DEFAULT,
+        ) as mocks:
+            attempt_synchronous_processing(self.doc, self.pdf_path)
+        mock_openrouter = mocks['attempt_openrouter_sync']
+
+        mock_openrouter.assert_not_called()
+        self.assertEqual('pending', OpenRouterSummary.objects.get(pdf_document=self.doc).status)
 
     def test_verapdf_timeout_stops_openrouter_attempt(self) -> None:
         """
@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from pdf_checker_app.models import PDFDocument
+
+log = logging.getLogger(__name__)
+TestCase.maxDiff = 1000
+
+PDF_CONTENT: bytes = b'%PDF-1.4 upload test content'
+
+
+@patch('pdf_checker_app.forms.get_magic', return_value=None)
+class UploadPDFTest(TestCase):
+    """
+    Checks the upload view's save, dedupe, and redirect flow.
+    """
+
+    def setUp(self):
+        """
+        Points PDF_UPLOAD_PATH at a temp directory.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.upload_dir = Path(temp_dir.name)
+        settings_override = override_settings(PDF_UPLOAD_PATH=temp_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def post_pdf(self):
+        """
+        Posts PDF_CONTENT to the upload view.
+        """
+        upload = SimpleUploadedFile('test.pdf', PDF_CONTENT, content_type='application/pdf')
+        return self.client.post(reverse('pdf_upload_url'), {'pdf_file': upload})
+
+    def test_new_upload_saves_file_and_creates_document(self, _mock_get_magic):
+        """
+        Checks that a new upload is saved as `{checksum}.pdf`, recorded, and redirected to its report.
+        """
+        checksum = hashlib.sha256(PDF_CONTENT).hexdigest()
+        with patch('pdf_checker_app.views.sync_processing_helpers.attempt_synchronous_processing') as mock_sync:
+            response = self.post_pdf()
+        doc = PDFDocument.objects.get(file_checksum=checksum)
+        self.assertRedirects(response, reverse('pdf_report_url', kwargs={'pk': doc.pk}), fetch_redirect_response=False)
+        self.assertEqual(PDF_CONTENT, (self.upload_dir.resolve() / f'{checksum}.pdf').read_bytes())
+        mock_sync.assert_called_once_with(doc, self.upload_dir.resolve() / f'{checksum}.pdf')
+
+    def test_upload_with_sync_processing_disabled_only_queues(self, _mock_get_magic):
+        """
+        Checks that with SYNC_PROCESSING_ENABLED off, an upload is left 'pending' for cron and redirected immediately.
+        """
+        with override_settings(SYNC_PROCESSING_ENABLED=False):
+            with patch('pdf_checker_app.views.sync_processing_helpers.attempt_synchronous_processing') as mock_sync:
+                response = self.post_pdf()
+        doc = PDFDocument.objects.get()
+        self.assertRedirects(response, reverse('pdf_report_url', kwargs={'pk': doc.pk}), fetch_redirect_response=False)
+        mock_sync.assert_not_called()
+        self.assertEqual('pending', doc.processing_status)
+
+    def test_failed_reupload_is_reset_by_sync_processing_write(self, _mock_get_magic):
+        """
+        Checks that re-uploading a failed PDF hands sync processing the reset document without a separate 'pending' write.
+        """
+        checksum = hashlib.sha256(PDF_CONTENT).hexdigest()
+        existing = PDFDocument.objects.create(
+            original_filename='test.pdf',
+            file_checksum=checksum,
+            file_size=len(PDF_CONTENT),
+            processing_status='failed',
+            processing_error='old error',
+        )
+        with patch('pdf_checker_app.views.sync_processing_helpers.attempt_synchronous_processing') as mock_sync:
+            self.post_pdf()
+        synced_doc = mock_sync.call_args.args[0]
+        self.assertEqual(existing.pk, synced_doc.pk)
+        self.assertEqual(('pending', None), (synced_doc.processing_status, synced_doc.processing_error))
+        ## the (mocked) sync processing would have written the reset; the view itself didn't
+        self.assertEqual('failed', PDFDocument.objects.get(pk=existing.pk).processing_status)
+
+    def test_duplicate_completed_upload_redirects_without_reprocessing(self, _mock_get_magic):
+        """
+        Checks that re-uploading an already-completed PDF redirects to the existing report without writing the file.
+        """
+        checksum = hashlib.sha256(PDF_CONTENT).hexdigest()
+        existing = PDFDocument.objects.create(
+            original_filename='test.pdf',
+            file_checksum=checksum,
+            file_size=len(PDF_CONTENT),
+            processing_status='completed',
+        )
+        with patch('pdf_checker_app.views.sync_processing_helpers.attempt_synchronous_processing') as mock_sync:
+            response = self.post_pdf()
+        self.assertRedirects(response, reverse('pdf_report_url', kwargs={'pk': existing.pk}), fetch_redirect_response=False)
+        mock_sync.assert_not_called()
+        self.assertEqual(1, PDFDocument.objects.count())
+        self.assertEqual([], list(self.upload_dir.iterdir()))
+
+    def test_save_failure_rerenders_form_without_creating_document(self, _mock_get_magic):
+        """
+        Checks that a failed save shows an error on the upload page and leaves no document record behind.
+        """
+        with patch('pdf_checker_app.views.pdf_helpers.save_pdf_file', side_effect=OSError('disk full')):
+            response = self.post_pdf()
+        self.assertEqual(200, response.status_code)
+        self.assertContains(response, 'Failed to save PDF file. Please try again.')
+        self.assertEqual(0, PDFDocument.objects.count())
@@ -1,23 +1,26 @@
 import datetime
-import json
 import logging
 import uuid
 from pathlib import Path
 
-import trio
+import orjson
 from django.conf import settings as project_settings
 from django.contrib import messages
 from django.http import HttpRequest, HttpResponse, HttpResponseNotFound, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 
 from pdf_checker_app.forms import PDFUploadForm
 from pdf_checker_app.lib import markdown_helpers, pdf_helpers, sync_processing_helpers, version_helper
-from pdf_checker_app.lib.version_helper import GatherCommitAndBranchData
 from pdf_checker_app.models import OpenRouterSummary, PDFDocument, VeraPDFResult
 
 log = logging.getLogger(__name__)
 
+## a completed document's status never changes (failed ones can be re-uploaded), so browsers may reuse it
+COMPLETED_STATUS_CACHE_CONTROL = 'private, max-age=600'
+
 
 # -------------------------------------------------------------------
 # main urls
@@ -36,17 +39,11 @@ def info(request):
     log.debug('starting info()')
     ## prep data ----------------------------------------------------
     info_html: str = markdown_helpers.load_markdown_from_lib('info.md')
-    context = {
-        'foo': 'bar',
-        'info_html': info_html,
-    }
+    context: dict[str, str] = markdown_helpers.build_info_context(info_html)
     ## prep response ------------------------------------------------
     if request.GET.get('format', '') == 'json':
         log.debug('building json response')
-        resp = HttpResponse(
-            json.dumps(context, sort_keys=True, indent=2),
-            content_type='application/json; charset=utf-8',
-        )
+        resp = HttpResponse(markdown_helpers.build_info_json(info_html), content_type='application/json; charset=utf-8')
     else:
         log.debug('building template response')
         resp = render(request, 'pdf_checker_app/info.html', context)
@@ -59,6 +56,7 @@ def upload_pdf(request: HttpRequest) -> HttpResponse:
 
     Attempts to run veraPDF and OpenRouter synchronously with timeouts.
     Falls back to polling + cron if timeouts are hit.
+    With SYNC_PROCESSING_ENABLED off, just queues the document for the cron jobs and redirects.
     """
     log.debug('\n\nstarting upload_pdf()\n\n')
     if request.method == 'POST':
@@ -69,7 +67,7 @@ def upload_pdf(request: HttpRequest) -> HttpResponse:
             ## Get Shibboleth user info
             user_info: dict[str, str | list[str]] = pdf_helpers.get_shibboleth_user_info(request)
 
-            ## Generate checksum
+            ## Generate checksum from the upload stream; nothing is written to disk until it's known to be needed
             checksum: str = pdf_helpers.generate_checksum(pdf_file)
 
             ## Check if already processed
@@ -84,12 +82,23 @@ def upload_pdf(request: HttpRequest) -> HttpResponse:
                 messages.info(request, 'This PDF is already being processed.')
                 return HttpResponseRedirect(reverse('pdf_report_url', kwargs={'pk': existing_doc.pk}))
 
+            ## Save file (only new and failed docs get here)
+            try:
+                pdf_path: Path = pdf_helpers.save_pdf_file(pdf_file, checksum)
+                log.debug('saved PDF file to %s', pdf_path)
+            except Exception:
+                log.exception('Failed to save PDF file')
+                messages.error(request, 'Failed to save PDF file. Please try again.')
+                return render(request, 'pdf_checker_app/upload.html', {'form': form})
+
             ## For failed docs, allow re-upload by resetting to pending
             if existing_doc and existing_doc.processing_status == 'failed':
                 doc: PDFDocument = existing_doc
                 doc.processing_status = 'pending'
                 doc.processing_error = None
-                doc.save(update_fields=['processing_status', 'processing_error'])
+                ## with sync processing on, its 'processing' mark below overwrites both fields, so skip this write
+                if not project_settings.SYNC_PROCESSING_ENABLED:
+                    PDFDocument.objects.filter(pk=doc.pk).update(processing_status='pending', processing_error=None)
             else:
                 ## Create new document record with Shibboleth user info
                 doc: PDFDocument = PDFDocument.objects.create(
@@ -103,20 +112,9 @@ def upload_pdf(request: HttpRequest) -> HttpResponse:
                     processing_status='pending',
                 )
 
-            ## Save file
-            try:
-                pdf_path: Path = pdf_helpers.save_pdf_file(pdf_file, checksum)
-                log.debug(f'saved PDF file to {pdf_path}')
-            except Exception as exc:
-                log.exception('Failed to save PDF file')
-                doc.processing_status = 'failed'
-                doc.processing_error = f'Failed to save file: {exc}'
-                doc.save(update_fields=['processing_status', 'processing_error'])
-                messages.error(request, 'Failed to save PDF file. Please try again.')
-                return HttpResponseRedirect(reverse('pdf_report_url', kwargs={'pk': doc.pk}))
-
-            ## Attempt synchronous processing
-            sync_processing_helpers.attempt_synchronous_processing(doc, pdf_path)
+            ## Attempt synchronous processing (otherwise the 'pending' doc is left for the cron jobs)
+            if project_settings.SYNC_PROCESSING_ENABLED:
+                sync_processing_helpers.attempt_synchronous_processing(doc, pdf_path)
 
             ## Redirect to report page
             if doc.processing_status == 'completed':
@@ -136,18 +134,21 @@ def view_report(request, pk: uuid.UUID):
     """
     Displays the accessibility report for a processed PDF.
     """
-    log.debug(f'starting view_report() for pk={pk}')
-    doc = get_object_or_404(PDFDocument, pk=pk)
+    log.debug('starting view_report() for pk=%s', pk)
+    doc = get_object_or_404(PDFDocument.objects.with_results(), pk=pk)  # one joined query for all three rows
     verapdf_raw_json: str | None = None
     assessment: str | None = None
     verapdf_raw_json_data: dict[str, object] | None = None
     if doc.processing_status == 'completed':
-        raw_json_data = VeraPDFResult.objects.filter(pdf_document=doc).values_list('raw_json', flat=True).first()
+        raw_json_data: object | None = None
+        try:
+            raw_json_data = doc.verapdf_result.raw_json
+        except VeraPDFResult.DoesNotExist:
+            pass
         if isinstance(raw_json_data, dict):
             verapdf_raw_json_data = raw_json_data
-            verapdf_raw_json = json.dumps(raw_json_data, indent=2)
-        elif raw_json_data is not None:
-            verapdf_raw_json = json.dumps(raw_json_data, indent=2)
+        if raw_json_data is not None:
+            verapdf_raw_json = doc.verapdf_result.raw_json_pretty or pdf_helpers.format_verapdf_json(raw_json_data)
 
     if verapdf_raw_json_data is not None:
         assessment = pdf_helpers.get_accessibility_assessment(verapdf_raw_json_data)
@@ -170,7 +171,7 @@ def view_report(request, pk: uuid.UUID):
         'suggestions': suggestions,
         'suggestions_html': suggestions_html,
     }
-    log.debug(f'context, ``{context}``')
+    log.debug('context, ``%s``', context)
 
     return render(
         request,
@@ -189,33 +190,41 @@ def status_fragment(request, pk: uuid.UUID):
     Returns a small HTML fragment for the status area.
     Used by htmx polling on the report page.
     Stops polling when processing is complete or failed.
+    The fragment depends only on the status, so a poll whose ETag still matches gets a bodiless 304 instead of a render.
     """
-    log.debug(f'starting status_fragment() for pk={pk}')
-    doc = get_object_or_404(PDFDocument, pk=pk)
-
-    assessment: str | None = None
-    if doc.processing_status == 'completed':
-        verapdf_raw_json_data = VeraPDFResult.objects.filter(pdf_document=doc).values_list('raw_json', flat=True).first()
-        if isinstance(verapdf_raw_json_data, dict):
-            assessment = pdf_helpers.get_accessibility_assessment(verapdf_raw_json_data)
-    log.debug(f'assessment, ``{assessment}``')
-
-    ## Determine if we should continue polling
-    is_terminal = doc.processing_status in ('completed', 'failed')
-
-    context = {
-        'document': doc,
-        'is_terminal': is_terminal,
-        'assessment': assessment,
-    }
-    log.debug(f'context, ``{context}``')
+    log.debug('starting status_fragment() for pk=%s', pk)
+    doc = get_object_or_404(PDFDocument.objects.only('id', 'processing_status'), pk=pk)  # all the fragment reads
+
+    etag: str = quote_etag(doc.processing_status)
+    ## polling states must revalidate (no-cache) rather than skip the cache (no-store), or no If-None-Match is ever sent
+    cache_control: str = COMPLETED_STATUS_CACHE_CONTROL if doc.processing_status == 'completed' else 'no-cache'
+    ## a poll whose ETag still matches gets the bodiless 304; otherwise the fragment is rendered
+    response: HttpResponse | None = get_conditional_response(request, etag=etag)
+    if response is None:
+        assessment: str | None = None
+        if doc.processing_status == 'completed':
+            verapdf_raw_json_data = VeraPDFResult.objects.filter(pdf_document=doc).values_list('raw_json', flat=True).first()
+            if isinstance(verapdf_raw_json_data, dict):
+                assessment = pdf_helpers.get_accessibility_assessment(verapdf_raw_json_data)
+        log.debug('assessment, ``%s``', assessment)
+
+        ## Determine if we should continue polling
+        is_terminal = doc.processing_status in ('completed', 'failed')
+
+        context = {
+            'document': doc,
+            'is_terminal': is_terminal,
+            'assessment': assessment,
+        }
+        log.debug('context, ``%s``', context)
 
-    response = render(
-        request,
-        'pdf_checker_app/fragments/status_fragment.html',
-        context,
-    )
-    response['Cache-Control'] = 'no-store'
+        response = render(
+            request,
+            'pdf_checker_app/fragments/status_fragment.html',
+            context,
+        )
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
     return response
 
 
@@ -224,14 +233,15 @@ def verapdf_fragment(request, pk: uuid.UUID):
     Returns an HTML fragment for the veraPDF results section.
     Called once when status indicates veraPDF is ready.
     """
-    log.debug(f'starting verapdf_fragment() for pk={pk}')
-    doc = get_object_or_404(PDFDocument, pk=pk)
+    log.debug('starting verapdf_fragment() for pk=%s', pk)
+    doc = get_object_or_404(PDFDocument.objects.only('id', 'processing_status'), pk=pk)  # all the fragment reads
 
     verapdf_raw_json: str | None = None
     if doc.processing_status == 'completed':
-        verapdf_raw_json_data = VeraPDFResult.objects.filter(pdf_document=doc).values_list('raw_json', flat=True).first()
-        if verapdf_raw_json_data is not None:
-            verapdf_raw_json = json.dumps(verapdf_raw_json_data, indent=2)
+        verapdf_results = VeraPDFResult.objects.filter(pdf_document=doc)
+        verapdf_raw_json = verapdf_results.values_list('raw_json_pretty', flat=True).first()
+        if verapdf_raw_json == '':  ## saved before raw_json_pretty existed
+            verapdf_raw_json = pdf_helpers.format_verapdf_json(verapdf_results.values_list('raw_json', flat=True).first())
 
     response = render(
         request,
@@ -250,8 +260,9 @@ def summary_fragment(request, pk: uuid.UUID):
     Returns an HTML fragment for the OpenRouter summary section.
     Can be polled or loaded once depending on UX preference.
     """
-    log.debug(f'starting summary_fragment() for pk={pk}')
-    doc = get_object_or_404(PDFDocument, pk=pk)
+    log.debug('starting summary_fragment() for pk=%s', pk)
+    ## one joined query for all three rows; the display copy of the veraPDF JSON isn't shown here
+    doc = get_object_or_404(PDFDocument.objects.with_results().defer('verapdf_result__raw_json_pretty'), pk=pk)
 
     suggestions: OpenRouterSummary | None = None
     try:
@@ -260,7 +271,11 @@ def summary_fragment(request, pk: uuid.UUID):
         pass
 
     assessment: str | None = None
-    verapdf_raw_json = VeraPDFResult.objects.filter(pdf_document=doc).values_list('raw_json', flat=True).first()
+    verapdf_raw_json: object | None = None
+    try:
+        verapdf_raw_json = doc.verapdf_result.raw_json
+    except VeraPDFResult.DoesNotExist:
+        pass
     if isinstance(verapdf_raw_json, dict):
         assessment = pdf_helpers.get_accessibility_assessment(verapdf_raw_json)
 
@@ -295,7 +310,7 @@ def error_check(request):
     - (or substitue your own settings for localhost:1026)
     """
     log.debug('starting error_check()')
-    log.debug(f'project_settings.DEBUG, ``{project_settings.DEBUG}``')
+    log.debug('project_settings.DEBUG, ``%s``', project_settings.DEBUG)
     if project_settings.DEBUG is True:  # localdev and dev-server; never production
         log.debug('triggering exception')
         raise Exception('Raising intentional exception to check email-admins-on-error functionality.')
@@ -310,10 +325,8 @@ def version(request):
     """
     log.debug('starting version()')
     rq_now = datetime.datetime.now()
-    gatherer = GatherCommitAndBranchData()
-    trio.run(gatherer.manage_git_calls)
-    info_txt = f'{gatherer.branch} {gatherer.commit}'
+    info_txt = version_helper.get_branch_and_commit_text()
     context = version_helper.make_context(request, rq_now, info_txt)
-    output = json.dumps(context, sort_keys=True, indent=2)
-    log.debug(f'output, ``{output}``')
+    output: bytes = orjson.dumps(context, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    log.debug('output, ``%s``', output)
     return HttpResponse(output, content_type='application/json; charset=utf-8')
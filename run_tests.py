@@ -7,6 +7,7 @@ Usage examples:
     (file) uv run ./run_tests.py -v tests.test_environment_checks
     (class) uv run ./run_tests.py -v tests.test_environment_checks.TestEnvironmentChecks
     (method) uv run ./run_tests.py -v tests.test_environment_checks.TestEnvironmentChecks.test_check_branch_non_main_raises
+    (parallel) uv run ./run_tests.py --parallel auto
 """
 
 import argparse
@@ -17,6 +18,7 @@ from pathlib import Path
 
 import django
 from django.conf import settings  # type: ignore
+from django.test.runner import get_max_test_processes  # type: ignore
 from django.test.utils import get_runner  # type: ignore
 
 
@@ -42,6 +44,11 @@ def main() -> None:
         action='store_true',
         help='Increase verbosity (equivalent to unittest verbosity=2)',
     )
+    parser.add_argument(
+        '--parallel',
+        default='1',
+        help='Number of test processes, or `auto` for one per core (default: 1)',
+    )
     parser.add_argument(
         'targets',
         nargs='*',
@@ -73,7 +80,8 @@ def main() -> None:
     verbosity = 2 if args.verbose else 1
     test_labels: list[str] = list(args.targets) if args.targets else []
     TestRunner = get_runner(settings)
-    test_runner = TestRunner(verbosity=verbosity, interactive=False)
+    parallel: int = get_max_test_processes() if args.parallel == 'auto' else int(args.parallel)
+    test_runner = TestRunner(verbosity=verbosity, interactive=False, parallel=parallel)
     failures = test_runner.run_tests(test_labels)
     sys.exit(0 if failures == 0 else 1)
 
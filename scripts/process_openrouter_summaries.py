@@ -6,7 +6,7 @@ Finds PDFDocument rows with completed veraPDF processing but no summary,
 calls OpenRouter API, and persists the results.
 
 Usage:
-    uv run ./scripts/process_openrouter_summaries.py [--batch-size N] [--dry-run]
+    uv run ./scripts/process_openrouter_summaries.py [--batch-size N] [--max-workers N] [--dry-run]
 
 Requires:
     OPENROUTER_API_KEY environment variable to be set.
@@ -17,7 +17,7 @@ import argparse
 import logging
 import os
 import sys
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ## Django setup - must happen before importing Django models
@@ -34,11 +34,12 @@ import django  # noqa: E402
 django.setup()
 
 from django.conf import settings as project_settings  # noqa: E402
+from django.db import connection  # noqa: E402
 from django.db.models import Q  # noqa: E402
 from django.utils import timezone as django_timezone  # noqa: E402
 
 from pdf_checker_app.lib import openrouter_helpers  # noqa: E402
-from pdf_checker_app.models import OpenRouterSummary, PDFDocument, VeraPDFResult  # noqa: E402
+from pdf_checker_app.models import OpenRouterSummary, PDFDocument  # noqa: E402
 
 
 def get_api_key() -> str:
@@ -54,96 +55,82 @@ def find_pending_summaries(batch_size: int) -> list[PDFDocument]:
     Criteria:
     - processing_status == 'completed'
     - has a VeraPDFResult
-    - does NOT have an OpenRouterSummary OR has one with status 'pending'
+    - does NOT have an OpenRouterSummary OR has one with status 'pending' or 'failed'
+    - is not already accessible
+    Loads only the fields process_single_summary() reads; touching any other field costs an extra query.
     """
-    ## Find docs with completed veraPDF but no summary
-    docs_without_summary = (
-        PDFDocument.objects.filter(processing_status='completed')
-        .exclude(openrouter_summary__isnull=False)
-        .filter(verapdf_result__isnull=False)
-        .exclude(verapdf_result__is_accessible=True)
-        .order_by('uploaded_at')[:batch_size]
-    )
-
-    ## Find docs with pending or failed summary
-    docs_with_pending_summary = (
-        PDFDocument.objects.filter(
-            processing_status='completed',
+    docs = (
+        PDFDocument.objects.with_results()
+        .only(
+            'id',
+            'original_filename',
+            'uploaded_at',
+            'verapdf_result__pdf_document',
+            'verapdf_result__raw_json',
+            'openrouter_summary__pdf_document',
+            'openrouter_summary__status',
         )
-        .filter(Q(openrouter_summary__status='pending') | Q(openrouter_summary__status='failed'))
-        .filter(verapdf_result__isnull=False)
+        .filter(processing_status='completed', verapdf_result__isnull=False)
         .exclude(verapdf_result__is_accessible=True)
+        .filter(Q(openrouter_summary__isnull=True) | Q(openrouter_summary__status__in=['pending', 'failed']))
         .order_by('uploaded_at')[:batch_size]
     )
+    return list(docs)
 
-    ## Combine and deduplicate
-    doc_ids = set()
-    result: list[PDFDocument] = []
-    for doc in list(docs_without_summary) + list(docs_with_pending_summary):
-        if doc.pk not in doc_ids and len(result) < batch_size:
-            doc_ids.add(doc.pk)
-            result.append(doc)
 
-    return result
-
-
-def get_model_order() -> list[str]:
+def get_model_order() -> tuple[str, ...]:
     """
     Retrieves the OpenRouter model order from environment.
     """
     return openrouter_helpers.get_model_order()
 
 
-def process_single_summary(doc: PDFDocument, api_key: str, model_order: list[str]) -> bool:
+def process_single_summary(doc: PDFDocument, api_key: str, model_order: tuple[str, ...]) -> bool:
     """
     Generates and saves an OpenRouter summary for a single document.
     Returns True on success, False on failure.
-    Called by process_summaries()
+    Called by process_summaries() and process_single_summary_in_thread()
     """
     log.info(f'Processing summary for document {doc.pk} ({doc.original_filename})')
 
-    ## Get or create the summary record
-    summary: OpenRouterSummary
-    created: bool
-    utc_now = datetime.now(tz=timezone.utc)
-    naive_now = django_timezone.make_naive(utc_now)
-    summary, created = OpenRouterSummary.objects.get_or_create(
-        pdf_document=doc,
-        defaults={'status': 'processing', 'requested_at': naive_now},
-    )
-
-    if not created:
-        utc_now = datetime.now(tz=timezone.utc)
-        naive_now = django_timezone.make_naive(utc_now)
-        summary.status = 'processing'
-        summary.requested_at = naive_now
-        summary.error = None
-        summary.save(update_fields=['status', 'requested_at', 'error'])
+    ## Reuse the summary record loaded by find_pending_summaries(), if any
+    summary: OpenRouterSummary | None = getattr(doc, 'openrouter_summary', None)
 
     success = False
     try:
-        ## Get veraPDF result
-        verapdf_result = VeraPDFResult.objects.get(pdf_document=doc)
-        raw_verapdf_json = verapdf_result.raw_json
+        ## Get veraPDF result (already joined in by find_pending_summaries())
+        raw_verapdf_json = doc.verapdf_result.raw_json
 
         ## Prune checks
         verapdf_json = openrouter_helpers.filter_down_failure_checks(raw_verapdf_json)
 
-        ## Build prompt
+        ## Build prompt (always fresh, so a re-run veraPDF result or an edited prompt template is picked up)
         prompt = openrouter_helpers.build_prompt(verapdf_json)
-        log.debug(f'Calling OpenRouter for document {doc.pk}')
 
-        ## Save prompt
-        summary.prompt = prompt
-        summary.save(update_fields=['prompt'])
+        ## Mark the summary processing, with its prompt, in a single write
+        naive_now = django_timezone.now()  # naive local time, since USE_TZ is False
+        created = False
+        if summary is None:
+            summary, created = OpenRouterSummary.objects.get_or_create(
+                pdf_document=doc,
+                defaults={'status': 'processing', 'requested_at': naive_now, 'prompt': prompt},
+            )
+        if not created:
+            summary.status = 'processing'
+            summary.requested_at = naive_now
+            summary.prompt = prompt
+            summary.error = None
+            summary.save(update_fields=['status', 'requested_at', 'prompt', 'error'])
+        log.debug(f'Calling OpenRouter for document {doc.pk}')
 
-        ## Call API with cron timeout
+        ## Call API with cron timeout; transient 429/5xx responses are retried within this run rather than the next
         timeout_seconds = project_settings.OPENROUTER_CRON_TIMEOUT_SECONDS
-        response_json = openrouter_helpers.call_openrouter_with_model_order(
+        response_json = openrouter_helpers.call_openrouter_with_retries(
             prompt,
             api_key,
             model_order,
             timeout_seconds,
+            deadline_seconds=project_settings.OPENROUTER_CRON_RETRY_DEADLINE_SECONDS,
         )
 
         ## Parse response
@@ -157,16 +144,32 @@ def process_single_summary(doc: PDFDocument, api_key: str, model_order: list[str
 
     except Exception as exc:
         log.exception(f'Failed to generate summary for document {doc.pk}')
-        summary.status = 'failed'
-        summary.error = str(exc)
-        summary.save(update_fields=['status', 'error'])
+        if summary is None:
+            ## Failed before the summary row was written (e.g., while building the prompt)
+            OpenRouterSummary.objects.update_or_create(pdf_document=doc, defaults={'status': 'failed', 'error': str(exc)})
+        else:
+            summary.status = 'failed'
+            summary.error = str(exc)
+            summary.save(update_fields=['status', 'error'])
 
     return success
 
 
-def process_summaries(batch_size: int, dry_run: bool) -> tuple[int, int]:
+def process_single_summary_in_thread(doc: PDFDocument, api_key: str, model_order: tuple[str, ...]) -> bool:
+    """
+    Runs process_single_summary() in a worker thread, closing that thread's DB connection afterwards.
+    Called by process_summaries()
+    """
+    try:
+        return process_single_summary(doc, api_key, model_order)
+    finally:
+        connection.close()
+
+
+def process_summaries(batch_size: int, dry_run: bool, max_workers: int = 1) -> tuple[int, int]:
     """
     Finds and processes pending OpenRouter summaries.
+    With max_workers > 1, the (network-bound) OpenRouter calls run concurrently, sharing the pooled HTTP client.
     Returns (success_count, failure_count).
     """
     api_key = get_api_key()
@@ -187,15 +190,22 @@ def process_summaries(batch_size: int, dry_run: bool) -> tuple[int, int]:
             log.info(f'[DRY RUN] Would generate summary for: {doc.pk} ({doc.original_filename})')
         return (0, 0)
 
-    success_count = 0
-    failure_count = 0
-
-    for doc in docs:
-        if process_single_summary(doc, api_key, model_order):
-            success_count += 1
-        else:
-            failure_count += 1
-
+    results: list[bool]
+    if max_workers > 1 and len(docs) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(docs))) as executor:
+            results = list(
+                executor.map(
+                    process_single_summary_in_thread,
+                    docs,
+                    [api_key] * len(docs),
+                    [model_order] * len(docs),
+                )
+            )
+    else:
+        results = [process_single_summary(doc, api_key, model_order) for doc in docs]
+
+    success_count = results.count(True)
+    failure_count = len(results) - success_count
     return (success_count, failure_count)
 
 
@@ -210,6 +220,12 @@ def main() -> None:
         default=1,
         help='Maximum number of summaries to generate in one run (default: 1)',
     )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=1,
+        help='Maximum number of summaries to generate concurrently (default: 1)',
+    )
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -232,7 +248,7 @@ def main() -> None:
     )
 
     log.info('Starting OpenRouter summary processor')
-    success_count, failure_count = process_summaries(args.batch_size, args.dry_run)
+    success_count, failure_count = process_summaries(args.batch_size, args.dry_run, args.max_workers)
     log.info(f'Finished: {success_count} succeeded, {failure_count} failed')
 
 
@@ -6,13 +6,14 @@ Finds PDFDocument rows in 'pending' or 'processing' state, runs veraPDF,
 and updates the database with results.
 
 Usage:
-    uv run ./scripts/process_verapdf_jobs.py [--batch-size N] [--dry-run]
+    uv run ./scripts/process_verapdf_jobs.py [--batch-size N] [--max-workers N] [--dry-run]
 """
 
 import argparse
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -28,7 +29,7 @@ import django  # noqa: E402
 django.setup()
 
 from django.conf import settings as project_settings  # noqa: E402
-from django.db import transaction  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
 
 from pdf_checker_app.lib import pdf_helpers  # noqa: E402
 from pdf_checker_app.models import PDFDocument  # noqa: E402
@@ -36,10 +37,11 @@ from pdf_checker_app.models import PDFDocument  # noqa: E402
 log = logging.getLogger(__name__)
 
 
-def find_pending_jobs(batch_size: int) -> list[PDFDocument]:
+def find_pending_jobs(batch_size: int, claim: bool = False) -> list[PDFDocument]:
     """
     Finds PDFDocument rows that need processing.
     Uses select_for_update with skip_locked to avoid double-processing.
+    With `claim`, also marks the selected rows 'processing' in one UPDATE, while they're still locked.
 
     Selection criteria:
     - Always include 'pending' status
@@ -71,22 +73,31 @@ def find_pending_jobs(batch_size: int) -> list[PDFDocument]:
             )
 
         jobs = pending_jobs + stuck_jobs
+
+        if claim and jobs:
+            started_at = datetime.now()
+            PDFDocument.objects.filter(pk__in=[doc.pk for doc in jobs]).update(
+                processing_status='processing',
+                processing_error=None,
+                processing_started_at=started_at,
+            )
+            for doc in jobs:
+                doc.processing_status = 'processing'
+                doc.processing_error = None
+                doc.processing_started_at = started_at
     return jobs
 
 
 def process_single_job(doc: PDFDocument, verapdf_path: Path) -> bool:
     """
-    Processes a single PDFDocument with veraPDF.
+    Processes a single PDFDocument with veraPDF; the doc has already been marked 'processing' by find_pending_jobs().
+    Re-stamps processing_started_at just before veraPDF runs, so a job that waited behind others in the batch
+    isn't mistaken for a stuck one by an overlapping cron run.
     Returns True on success, False on failure.
+    Called by process_jobs() and process_single_job_in_thread()
     """
     log.info(f'Processing document {doc.pk} ({doc.original_filename})')
 
-    ## Mark as processing
-    doc.processing_status = 'processing'
-    doc.processing_error = None
-    doc.processing_started_at = datetime.now()
-    doc.save(update_fields=['processing_status', 'processing_error', 'processing_started_at'])
-
     ## Resolve PDF path from checksum
     upload_dir = Path(project_settings.PDF_UPLOAD_PATH).resolve()
     pdf_path = upload_dir / f'{doc.file_checksum}.pdf'
@@ -101,6 +112,10 @@ def process_single_job(doc: PDFDocument, verapdf_path: Path) -> bool:
 
     success = False
     try:
+        ## Mark the real start time (the batch claim stamped every job at once)
+        doc.processing_started_at = datetime.now()
+        PDFDocument.objects.filter(pk=doc.pk).update(processing_started_at=doc.processing_started_at)
+
         ## Run veraPDF with cron timeout
         log.debug(f'Running veraPDF on {pdf_path}')
         timeout_seconds = project_settings.VERAPDF_CRON_TIMEOUT_SECONDS
@@ -109,13 +124,12 @@ def process_single_job(doc: PDFDocument, verapdf_path: Path) -> bool:
         ## Parse output
         parsed_output = pdf_helpers.parse_verapdf_output(verapdf_raw_json)
 
-        ## Persist result
-        pdf_helpers.save_verapdf_result(doc.id, parsed_output)
-
-        ## Mark as completed
-        doc.processing_status = 'completed'
-        doc.processing_error = None
-        doc.save(update_fields=['processing_status', 'processing_error'])
+        ## Persist result and mark as completed, in one commit
+        with transaction.atomic():
+            pdf_helpers.save_verapdf_result(doc.id, parsed_output)
+            doc.processing_status = 'completed'
+            doc.processing_error = None
+            doc.save(update_fields=['processing_status', 'processing_error'])
 
         log.info(f'Successfully processed document {doc.pk}')
         success = True
@@ -129,14 +143,26 @@ def process_single_job(doc: PDFDocument, verapdf_path: Path) -> bool:
     return success
 
 
-def process_jobs(batch_size: int, dry_run: bool) -> tuple[int, int]:
+def process_single_job_in_thread(doc: PDFDocument, verapdf_path: Path) -> bool:
+    """
+    Runs process_single_job() in a worker thread, closing that thread's DB connection afterwards.
+    Called by process_jobs()
+    """
+    try:
+        return process_single_job(doc, verapdf_path)
+    finally:
+        connection.close()
+
+
+def process_jobs(batch_size: int, dry_run: bool, max_workers: int = 1) -> tuple[int, int]:
     """
     Finds and processes pending veraPDF jobs.
+    With max_workers > 1, the veraPDF subprocesses (each its own JVM) run concurrently.
     Returns (success_count, failure_count).
     """
     verapdf_path = Path(project_settings.VERAPDF_PATH)
 
-    jobs = find_pending_jobs(batch_size)
+    jobs = find_pending_jobs(batch_size, claim=not dry_run)
     log.info(f'Found {len(jobs)} jobs to process')
 
     if dry_run:
@@ -144,15 +170,15 @@ def process_jobs(batch_size: int, dry_run: bool) -> tuple[int, int]:
             log.info(f'[DRY RUN] Would process: {doc.pk} ({doc.original_filename})')
         return (0, 0)
 
-    success_count = 0
-    failure_count = 0
-
-    for doc in jobs:
-        if process_single_job(doc, verapdf_path):
-            success_count += 1
-        else:
-            failure_count += 1
+    results: list[bool]
+    if max_workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            results = list(executor.map(process_single_job_in_thread, jobs, [verapdf_path] * len(jobs)))
+    else:
+        results = [process_single_job(doc, verapdf_path) for doc in jobs]
 
+    success_count = results.count(True)
+    failure_count = len(results) - success_count
     return (success_count, failure_count)
 
 
@@ -167,6 +193,12 @@ def main() -> None:
         default=5,
         help='Maximum number of jobs to process in one run (default: 5)',
     )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=1,
+        help='Maximum number of veraPDF jobs to run concurrently (default: 1)',
+    )
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -189,7 +221,7 @@ def main() -> None:
     )
 
     log.info('Starting veraPDF job processor')
-    success_count, failure_count = process_jobs(args.batch_size, args.dry_run)
+    success_count, failure_count = process_jobs(args.batch_size, args.dry_run, args.max_workers)
     log.info(f'Finished: {success_count} succeeded, {failure_count} failed')
 
 